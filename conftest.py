@@ -2,7 +2,11 @@ import pytest
 import sys
 import asyncio
 from pathlib import Path
-from typing import Generator
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional
+    uvloop = None
 
 # Add the project root to Python path
 root_dir = Path(__file__).parent
@@ -18,24 +22,14 @@ def pytest_configure(config):
         "markers",
         "timing_sensitive: marks tests that are sensitive to timing"
     )
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): run on the same pytest-xdist worker as the rest of the group"
+    )
 
-@pytest.fixture(scope="function")
-def event_loop():
-    """Create and manage event loop."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    
-    # Clean up pending tasks
-    try:
-        pending = asyncio.all_tasks(loop)
-        if pending:
-            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        loop.run_until_complete(loop.shutdown_asyncgens())
-    except Exception:
-        pass
-    
-    try:
-        loop.close()
-    except Exception:
-        pass
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Use uvloop for the session-wide event loop when it is available."""
+    if uvloop is not None and sys.platform != "win32":
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
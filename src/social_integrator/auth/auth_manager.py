@@ -28,18 +28,32 @@ class TokenInfo(BaseModel):
 class TokenStore:
     """Store for authentication tokens."""
     
-    def __init__(self, storage_path: str):
+    def __init__(self, storage_path: Optional[str] = None, backend: str = "file"):
         """Initialize token store.
         
         Args:
-            storage_path: Path to token storage file
+            storage_path: Path to token storage file; required for the file backend
+            backend: "file" to persist tokens as JSON, or "memory" to keep them
+                in this process only
+
+        Raises:
+            ValueError: If the backend is unknown or the file backend has no path
         """
-        self.storage_path = str(Path(storage_path).resolve())
+        if backend not in ("file", "memory"):
+            raise ValueError(f"Unknown token store backend: {backend}")
+        if backend == "file" and storage_path is None:
+            raise ValueError("storage_path is required for the file backend")
+
+        self.backend = backend
+        self.storage_path = str(Path(storage_path).resolve()) if storage_path else None
         self._tokens: Dict[str, TokenInfo] = {}
-        self._load_tokens()
+        if backend == "file":
+            self._load_tokens()
     
     def _load_tokens(self) -> None:
         """Load tokens from storage."""
+        if self.storage_path is None:
+            return
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
 
@@ -65,6 +79,8 @@ class TokenStore:
     
     def _save_tokens(self) -> None:
         """Save tokens to storage."""
+        if self.storage_path is None:
+            return
         try:
             data = {}
             for platform, token in self._tokens.items():
@@ -1,6 +1,6 @@
 from typing import Dict, Optional
 from pydantic_settings import BaseSettings
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 class PlatformConfig(BaseModel):
     """Base configuration for social media platforms."""
@@ -20,6 +20,14 @@ class TwitterConfig(PlatformConfig):
     """Twitter-specific configuration."""
     api_base_url: str = "https://api.twitter.com/2"
     media_upload_url: str = "https://upload.twitter.com/1.1/media/upload.json"
+    # Cached metrics are invalidated by writes. To bound staleness from
+    # changes made elsewhere, each tweet's entry also expires after a TTL
+    # that starts at the min age and doubles while its metrics stay
+    # unchanged, up to the max age
+    metrics_cache_min_age: float = Field(default=30.0, gt=0)
+    metrics_cache_max_age: float = Field(default=3600.0, gt=0)  # 1 hour
+    # Requests a client keeps in flight at once; further calls wait for a slot
+    max_concurrent_requests: int = Field(default=25, gt=0)
 
 class Settings(BaseSettings):
     """Global settings."""
@@ -2,7 +2,16 @@ from typing import Dict, List, Any, Optional, Sequence, Mapping
 from datetime import datetime
 import re
 import types
-from pydantic import BaseModel, field_validator, ConfigDict, model_validator
+from pydantic import BaseModel, field_validator, ConfigDict
+
+# Accepted media URL shape, compiled once at import
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 
 class SocialPost(BaseModel):
     """Social media post model."""
@@ -20,42 +29,34 @@ class SocialPost(BaseModel):
             raise ValueError("Content cannot be empty")
         return v
 
+    @field_validator('media_urls', mode='before')
+    @classmethod
+    def media_urls_to_tuple(cls, v: Any) -> Any:
+        """Accept any iterable of URLs, such as a generator or set."""
+        return tuple(v)
+
     @field_validator('media_urls')
     @classmethod
     def valid_media_urls(cls, v: Sequence[str]) -> Sequence[str]:
         """Validate media URLs."""
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
         for url in v:
-            if not url or not url_pattern.match(url):
+            if not url or not _URL_RE.match(url):
                 raise ValueError(f"Invalid media URL: {url}")
         return tuple(v)  # Convert to immutable tuple
 
-    @field_validator('metadata')
+    @field_validator('metadata', mode='before')
     @classmethod
     def validate_metadata(cls, v: Any) -> Mapping[str, Any]:
         """Validate metadata is a mapping."""
-        if isinstance(v, (dict, Mapping)):
-            return types.MappingProxyType(dict(v))
-        raise ValueError("Metadata must be a dictionary")
+        if not isinstance(v, (dict, Mapping)):
+            raise ValueError("Metadata must be a dictionary")
+        return v
 
-    @model_validator(mode='before')
+    @field_validator('metadata')
     @classmethod
-    def validate_collections(cls, values: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate and convert collections to immutable types."""
-        if 'media_urls' in values:
-            values['media_urls'] = tuple(values['media_urls'])
-        if 'metadata' in values:
-            if not isinstance(values['metadata'], (dict, Mapping)):
-                raise ValueError("Metadata must be a dictionary")
-            values['metadata'] = types.MappingProxyType(dict(values['metadata']))
-        return values
+    def freeze_metadata(cls, v: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Convert metadata to a read-only mapping."""
+        return types.MappingProxyType(dict(v))
 
 class PlatformError(Exception):
     """Base exception for platform errors."""
@@ -1,6 +1,18 @@
+import asyncio
+import email.utils
+import enum
+import functools
+import math
+import posixpath
+import re
+import sys
+import time
+import weakref
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
 import aiohttp
-from typing import Dict, Any, Optional
-import json
+import orjson
+from typing import AsyncIterator, Dict, Any, Iterable, List, Optional, Sequence
 
 from ..core.platform import (
     SocialPlatform,
@@ -8,18 +20,191 @@ from ..core.platform import (
     PlatformError,
     RateLimitError
 )
-from ..utils.rate_limiting import with_rate_limiting
+from ..utils.rate_limiting import AsyncBatcher, with_rate_limiting
+from ..utils.throttle import AdaptiveThrottle
 from ..core.config import TwitterConfig, get_platform_config
 
+# Twitter allows at most this many media items per tweet
+MAX_MEDIA_ITEMS = 4
+
+# Chunk size used when streaming media from its source to the upload endpoint
+MEDIA_CHUNK_SIZE = 64 * 1024
+
+# Twitter's limit on tweet IDs per lookup request
+METRICS_BATCH_SIZE = 100
+
+# How long get_metrics waits for concurrent calls to join its batch
+METRICS_BATCH_WINDOW = 0.02
+
+# Twitter's maximum tweet length in characters
+MAX_TWEET_LENGTH = 280
+
+# Twitter displays links at most this many characters long
+URL_DISPLAY_LENGTH = 23
+
+# Wait assumed when a rate limit response has no usable Retry-After header
+DEFAULT_RETRY_AFTER = 60
+
+# Content formatting patterns, compiled once at import
+_URL_RE = re.compile(r"https?://\S+")
+_LEADING_MENTION_RE = re.compile(r"^@\w+")
+
+def _parse_retry_after(value: Optional[str]) -> int:
+    """Parse a Retry-After header given as delta-seconds or an HTTP-date.
+    
+    Args:
+        value: Header value, if present
+        
+    Returns:
+        Seconds to wait; `DEFAULT_RETRY_AFTER` if the header is missing or
+        malformed
+    """
+    if value is None:
+        return DEFAULT_RETRY_AFTER
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    if retry_at.tzinfo is None:
+        # HTTP-dates are always GMT
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0, math.ceil((retry_at - datetime.now(timezone.utc)).total_seconds()))
+
+def _shorten_url(match: "re.Match[str]") -> str:
+    """Shorten a matched URL to its display form."""
+    url = match.group(0).split("://", 1)[1]
+    if url.startswith("www."):
+        url = url[4:]
+    if len(url) > URL_DISPLAY_LENGTH:
+        url = url[:URL_DISPLAY_LENGTH - 1] + "\u2026"
+    return url
+
+def _join_words(line: str) -> str:
+    """Collapse a line's whitespace, shortening any URLs among its words."""
+    if "://" not in line:
+        return " ".join(line.split())
+    return " ".join(
+        _URL_RE.sub(_shorten_url, word) if "://" in word else word
+        for word in line.split()
+    )
+
+def _normalize_text(text: str) -> str:
+    """Shorten URLs, collapse whitespace runs and keep at most one blank
+    line in a row, in a single pass over the words of each line."""
+    if "\n" not in text:
+        return _join_words(text)
+    
+    lines: List[str] = []
+    blank = False
+    for line in text.split("\n"):
+        line = _join_words(line)
+        if not line:
+            blank = bool(lines)
+            continue
+        if blank:
+            lines.append("")
+            blank = False
+        lines.append(line)
+    return "\n".join(lines)
+
+class MediaType(enum.Enum):
+    """Classification of a media URL."""
+    IMAGE = "image"
+    VIDEO = "video"
+    INVALID_URL = "invalid_url"
+    UNSUPPORTED_TYPE = "unsupported_type"
+
+_MEDIA_EXTENSIONS = {
+    ".jpg": MediaType.IMAGE,
+    ".jpeg": MediaType.IMAGE,
+    ".png": MediaType.IMAGE,
+    ".gif": MediaType.IMAGE,
+    ".webp": MediaType.IMAGE,
+    ".mp4": MediaType.VIDEO,
+    ".mov": MediaType.VIDEO,
+}
+
+@functools.lru_cache(maxsize=4096)
+def _classify_media_url(url: str) -> MediaType:
+    """Classify a media URL by scheme and file extension."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return MediaType.INVALID_URL
+    extension = posixpath.splitext(parts.path)[1].lower()
+    return _MEDIA_EXTENSIONS.get(extension, MediaType.UNSUPPORTED_TYPE)
+
+class _MetricsCacheEntry:
+    """Cached metrics for one tweet and the TTL they were cached with."""
+    __slots__ = ("metrics", "ttl", "expires_at")
+
+    def __init__(self, metrics: Dict[str, Any], ttl: float, expires_at: float):
+        self.metrics = metrics
+        self.ttl = ttl
+        self.expires_at = expires_at
+
+# Keep-alive connectors shared by clients that were not given one, per loop
+_shared_connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = (
+    weakref.WeakKeyDictionary()
+)
+# Open clients using each loop's shared connector; the last to close closes it
+_shared_connector_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Python versions whose asyncio can leak half-closed TLS transports
+_NEEDS_CLEANUP_CLOSED = (
+    sys.version_info < (3, 12, 8) or (3, 13, 0) <= sys.version_info < (3, 13, 1)
+)
+
+def _shared_connector() -> aiohttp.TCPConnector:
+    """Get the running loop's shared connector, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    connector = _shared_connectors.get(loop)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            # Abort TLS transports the server never finished closing, so a
+            # long-lived pool does not accumulate them. asyncio does this
+            # itself from 3.12.8 and 3.13.1, where aiohttp warns and ignores
+            # the flag
+            enable_cleanup_closed=_NEEDS_CLEANUP_CLOSED
+        )
+        _shared_connectors[loop] = connector
+    return connector
+
+async def close_shared_connector() -> None:
+    """Close the running loop's shared connector, if one was created."""
+    connector = _shared_connectors.pop(asyncio.get_running_loop(), None)
+    if connector is not None:
+        await connector.close()
+
 class TwitterAPI(SocialPlatform):
     """Twitter API implementation."""
     
-    def __init__(self, auth_token: str):
+    def __init__(
+        self,
+        auth_token: str,
+        connector: Optional[aiohttp.BaseConnector] = None
+    ):
         """Initialize Twitter API client.
         
         Args:
             auth_token: Bearer token for authentication
+            connector: Connector to pool connections through; the caller
+                keeps ownership and must close it. Defaults to a keep-alive
+                connector shared by all clients on the running loop
         """
+        self._connector = connector
+        # Built once and shared by every request through the session; the
+        # Content-Type is left to aiohttp so JSON and multipart bodies each
+        # get the right one
+        self._auth_headers = {"Authorization": f"Bearer {auth_token}"}
         super().__init__(auth_token=auth_token)
         
         # Get configuration
@@ -27,20 +212,53 @@ class TwitterAPI(SocialPlatform):
         if not isinstance(config, TwitterConfig):
             config = TwitterConfig()
         self.config = config
+        self._throttle = AdaptiveThrottle()
+        self._request_slots = asyncio.Semaphore(config.max_concurrent_requests)
+        self._metrics_batcher: AsyncBatcher[str, Optional[Dict[str, Any]]] = AsyncBatcher(
+            batch_size=METRICS_BATCH_SIZE,
+            batch_timeout=METRICS_BATCH_WINDOW,
+            process_func=self._fetch_metrics_batch
+        )
+        self._metrics_cache: Dict[str, _MetricsCacheEntry] = {}
+        # Fetches for cache misses, shared by every caller asking meanwhile
+        self._metrics_inflight: Dict[str, asyncio.Task] = {}
     
     def _initialize(self) -> None:
         """Initialize HTTP session."""
+        connector = self._connector
+        # Loop whose shared connector this client holds a reference to
+        self._shared_loop: Optional[asyncio.AbstractEventLoop] = None
+        if connector is None:
+            connector = _shared_connector()
+            self._shared_loop = asyncio.get_running_loop()
+            _shared_connector_clients[self._shared_loop] = (
+                _shared_connector_clients.get(self._shared_loop, 0) + 1
+            )
         self.session = aiohttp.ClientSession(
-            headers={
-                "Authorization": f"Bearer {self.auth_token}",
-                "Content-Type": "application/json"
-            }
+            connector=connector,
+            connector_owner=False,
+            headers=self._auth_headers
         )
     
     async def close(self) -> None:
-        """Close HTTP session."""
+        """Close HTTP session.
+        
+        A shared connector stays open while other clients still use it and
+        is closed along with the last one.
+        """
+        await self._metrics_batcher.close()
         if hasattr(self, 'session'):
             await self.session.close()
+        loop, self._shared_loop = getattr(self, '_shared_loop', None), None
+        if loop is not None:
+            clients = _shared_connector_clients.get(loop, 1) - 1
+            if clients > 0:
+                _shared_connector_clients[loop] = clients
+            else:
+                _shared_connector_clients.pop(loop, None)
+                connector = _shared_connectors.pop(loop, None)
+                if connector is not None:
+                    await connector.close()
     
     def _handle_error(self, status: int, data: Dict[str, Any]) -> None:
         """Handle error response.
@@ -49,22 +267,164 @@ class TwitterAPI(SocialPlatform):
             status: HTTP status code
             data: Response data
             
+        Raises:
+            PlatformError: Always, with the API's error message
+        """
+        message = data.get("detail", "Unknown error")
+        if isinstance(data.get("errors"), list):
+            message = data["errors"][0].get("message", message)
+        
+        raise PlatformError(f"Twitter API error: {message}")
+    
+    async def _handle_response(
+        self,
+        resp: aiohttp.ClientResponse
+    ) -> Dict[str, Any]:
+        """Decode a response, raising for error statuses.
+        
+        Args:
+            resp: API response
+            
+        Returns:
+            Response data
+            
         Raises:
             RateLimitError: If rate limited
-            PlatformError: For other errors
+            PlatformError: For other errors or an undecodable body
         """
-        if status == 429:  # Rate limit
-            retry_after = int(data.get("retry_after", 60))
+        if resp.status == 429:
+            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
             raise RateLimitError(
-                "Twitter API rate limit exceeded",
+                f"Rate limit exceeded by Twitter API, retry after {retry_after}s",
                 retry_after=retry_after
             )
         
-        message = data.get("detail", "Unknown error")
-        if isinstance(data.get("errors"), list):
-            message = data["errors"][0].get("message", message)
+        # orjson parses the raw bytes, skipping the str decode json() does
+        try:
+            data = orjson.loads(await resp.read())
+        except ValueError as e:
+            raise PlatformError(f"Invalid response from Twitter API: {e}")
         
-        raise PlatformError(f"Twitter API error: {message}")
+        if not resp.ok:
+            self._handle_error(resp.status, data)
+        
+        return data
+    
+    async def _format_content(self, post: SocialPost) -> str:
+        """Format post content as tweet text.
+        
+        Shortens URLs to their display form, collapses runs of whitespace,
+        limits blank lines to one, appends the unique ``metadata["tags"]`` as hashtags
+        and keeps a leading @mention visible to all followers.
+        
+        Args:
+            post: Post to format
+            
+        Returns:
+            Tweet text
+        """
+        text = _normalize_text(post.content)
+        
+        # Drop duplicate tags, keeping first-seen order
+        tags = dict.fromkeys(post.metadata.get("tags", []))
+        if tags:
+            text += " " + " ".join(f"#{tag}" for tag in tags)
+        
+        if _LEADING_MENTION_RE.match(text):
+            text = "." + text
+        
+        return text
+    
+    async def _validate_post(self, post: SocialPost) -> str:
+        """Check a post against Twitter's content and media rules.
+        
+        Args:
+            post: Post to validate
+            
+        Returns:
+            Formatted tweet text
+            
+        Raises:
+            PlatformError: If the post cannot be tweeted
+        """
+        text = await self._format_content(post)
+        if not text:
+            raise PlatformError("Tweet content cannot be empty")
+        if len(text) > MAX_TWEET_LENGTH:
+            raise PlatformError(
+                f"Tweet content exceeds {MAX_TWEET_LENGTH} characters"
+            )
+        
+        if len(post.media_urls) > MAX_MEDIA_ITEMS:
+            raise PlatformError(
+                f"Maximum {MAX_MEDIA_ITEMS} media items allowed"
+            )
+        for url in post.media_urls:
+            media_type = _classify_media_url(url)
+            if media_type is MediaType.INVALID_URL:
+                raise PlatformError(f"Invalid media URL: {url}")
+            if media_type is MediaType.UNSUPPORTED_TYPE:
+                raise PlatformError(f"Unsupported media type: {url}")
+        
+        return text
+    
+    async def _upload_one(self, url: str) -> str:
+        """Stream a media item from its URL to Twitter's upload endpoint.
+        
+        Args:
+            url: Media URL
+            
+        Returns:
+            Uploaded media ID
+            
+        Raises:
+            PlatformError: If download or upload fails
+        """
+        async with self._request_slots:
+            try:
+                async with self.session.get(url) as download:
+                    download.raise_for_status()
+                    
+                    # Stream the download straight into the upload body
+                    form = aiohttp.FormData()
+                    form.add_field(
+                        "media",
+                        download.content.iter_chunked(MEDIA_CHUNK_SIZE),
+                        filename="media",
+                        content_type="application/octet-stream"
+                    )
+                    try:
+                        async with self.session.post(
+                            self.config.media_upload_url,
+                            data=form
+                        ) as resp:
+                            resp_data = await self._handle_response(resp)
+                            return resp_data["media_id_string"]
+                    except aiohttp.ClientError as e:
+                        raise PlatformError(f"Failed to upload media: {e}")
+            except aiohttp.ClientError as e:
+                raise PlatformError(f"Failed to download media: {e}")
+    
+    async def _upload_media(self, urls: Sequence[str]) -> List[str]:
+        """Upload media items concurrently.
+        
+        Args:
+            urls: Media URLs
+            
+        Returns:
+            Media IDs in the same order as ``urls``
+            
+        Raises:
+            PlatformError: If any download or upload fails; the other
+                uploads are cancelled
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                uploads = [group.create_task(self._upload_one(url)) for url in urls]
+        except ExceptionGroup as e:
+            # Callers expect the PlatformError itself, not a group
+            raise e.exceptions[0] from None
+        return [upload.result() for upload in uploads]
     
     @with_rate_limiting(calls=300, period=900)
     async def post(self, post: SocialPost) -> Dict[str, Any]:
@@ -76,24 +436,33 @@ class TwitterAPI(SocialPlatform):
         Returns:
             Tweet data including ID
         """
-        data = {
-            "text": post.content,
+        text = await self._validate_post(post)
+        
+        if self._throttle.should_reject_locally():
+            raise RateLimitError(
+                "Twitter API requests throttled locally",
+                retry_after=1
+            )
+        
+        data: Dict[str, Any] = {
+            "text": text,
         }
         
         if post.media_urls:
-            # TODO: Implement media upload
-            pass
+            data["media"] = {
+                "media_ids": await self._upload_media(post.media_urls)
+            }
         
-        async with self.session.post(
-            f"{self.config.api_base_url}/tweets",
-            json=data
-        ) as resp:
-            resp_data = await resp.json()
-            
-            if not resp.ok:
-                self._handle_error(resp.status, resp_data)
-            
-            return resp_data
+        async with self._request_slots:
+            resp = await self.session.post(
+                f"{self.config.api_base_url}/tweets",
+                json=data
+            )
+            try:
+                self._throttle.record(resp.status != 429)
+                return await self._handle_response(resp)
+            finally:
+                resp.release()
     
     @with_rate_limiting(calls=300, period=900)
     async def delete_post(self, post_id: str) -> bool:
@@ -105,16 +474,16 @@ class TwitterAPI(SocialPlatform):
         Returns:
             True if deletion was successful
         """
-        async with self.session.delete(
+        async with self._request_slots, self.session.delete(
             f"{self.config.api_base_url}/tweets/{post_id}"
         ) as resp:
             if resp.status == 404:
                 return False
             
             if not resp.ok:
-                resp_data = await resp.json()
-                self._handle_error(resp.status, resp_data)
+                await self._handle_response(resp)
             
+            self.invalidate_metrics_cache(post_id)
             return True
     
     @with_rate_limiting(calls=300, period=900)
@@ -127,45 +496,175 @@ class TwitterAPI(SocialPlatform):
         Returns:
             Tweet data
         """
-        async with self.session.get(
+        async with self._request_slots, self.session.get(
             f"{self.config.api_base_url}/tweets/{post_id}"
         ) as resp:
             if resp.status == 404:
                 return {}
             
-            resp_data = await resp.json()
-            if not resp.ok:
-                self._handle_error(resp.status, resp_data)
-            
-            return resp_data
+            return await self._handle_response(resp)
+    
+    @staticmethod
+    def _format_metrics(tweet: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a tweet's public metrics to the integrator's metric names."""
+        metrics = tweet.get("public_metrics", {})
+        return {
+            "likes": metrics.get("like_count", 0),
+            "retweets": metrics.get("retweet_count", 0),
+            "replies": metrics.get("reply_count", 0),
+            "quotes": metrics.get("quote_count", 0)
+        }
     
     @with_rate_limiting(calls=300, period=900)
-    async def get_metrics(self, post_id: str) -> Dict[str, Any]:
-        """Get tweet metrics.
+    async def _lookup_metrics(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch metrics for up to `METRICS_BATCH_SIZE` tweets in one request.
         
         Args:
-            post_id: Tweet ID
+            post_ids: Tweet IDs
             
         Returns:
-            Tweet metrics
+            Metrics keyed by tweet ID; tweets that were not found are absent
         """
         params = {
+            "ids": ",".join(dict.fromkeys(post_ids)),
             "tweet.fields": "public_metrics"
         }
         
-        async with self.session.get(
-            f"{self.config.api_base_url}/tweets/{post_id}",
+        async with self._request_slots, self.session.get(
+            f"{self.config.api_base_url}/tweets",
             params=params
         ) as resp:
-            resp_data = await resp.json()
-            
-            if not resp.ok:
-                self._handle_error(resp.status, resp_data)
-            
-            metrics = resp_data["data"].get("public_metrics", {})
+            resp_data = await self._handle_response(resp)
             return {
-                "likes": metrics.get("like_count", 0),
-                "retweets": metrics.get("retweet_count", 0),
-                "replies": metrics.get("reply_count", 0),
-                "quotes": metrics.get("quote_count", 0)
+                tweet["id"]: self._format_metrics(tweet)
+                for tweet in resp_data.get("data", [])
             }
+    
+    async def _fetch_metrics_batch(
+        self,
+        post_ids: List[str]
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield metrics for a batch collected by the metrics batcher."""
+        found = await self._lookup_metrics(post_ids)
+        for post_id in post_ids:
+            yield found.get(post_id)
+    
+    def _cached_metrics(self, post_id: str, now: float) -> Optional[Dict[str, Any]]:
+        """Get cached metrics unless they expired."""
+        entry = self._metrics_cache.get(post_id)
+        if entry is None or now >= entry.expires_at:
+            return None
+        return entry.metrics
+    
+    def _cache_metrics(self, post_id: str, metrics: Dict[str, Any], now: float) -> None:
+        """Cache fetched metrics, adapting the tweet's TTL to how fast its
+        metrics change: unchanged metrics double it, changed ones reset it."""
+        config = self.config
+        entry = self._metrics_cache.get(post_id)
+        if entry is None or entry.metrics != metrics:
+            ttl = config.metrics_cache_min_age
+        else:
+            ttl = min(entry.ttl * 2, config.metrics_cache_max_age)
+        self._metrics_cache[post_id] = _MetricsCacheEntry(metrics, ttl, now + ttl)
+    
+    def invalidate_metrics_cache(self, post_id: Optional[str] = None) -> None:
+        """Expire cached metrics.
+        
+        Expired entries are kept so the next fetch can still tell whether
+        the metrics changed.
+        
+        Args:
+            post_id: Tweet whose metrics to expire; None expires all
+        """
+        entries: Iterable[_MetricsCacheEntry]
+        if post_id is None:
+            entries = self._metrics_cache.values()
+        else:
+            entry = self._metrics_cache.get(post_id)
+            entries = [entry] if entry is not None else []
+        for entry in entries:
+            entry.expires_at = -math.inf
+    
+    async def get_metrics(self, post_id: str) -> Dict[str, Any]:
+        """Get tweet metrics.
+        
+        Metrics are cached until a write through this client invalidates
+        them or their adaptive TTL runs out. Concurrent misses are
+        coalesced into a single batch lookup, and callers asking for a
+        tweet whose lookup is already in flight wait for that lookup.
+        
+        Args:
+            post_id: Tweet ID
+            
+        Returns:
+            Tweet metrics
+            
+        Raises:
+            PlatformError: If the tweet was not found
+        """
+        metrics = self._cached_metrics(post_id, time.monotonic())
+        if metrics is not None:
+            return dict(metrics)
+        
+        fetch = self._metrics_inflight.get(post_id)
+        if fetch is None:
+            fetch = asyncio.create_task(self._fetch_metrics(post_id))
+            self._metrics_inflight[post_id] = fetch
+            fetch.add_done_callback(
+                lambda _: self._metrics_inflight.pop(post_id, None)
+            )
+        # A cancelled caller must not cancel the fetch for the others
+        return dict(await asyncio.shield(fetch))
+    
+    async def _fetch_metrics(self, post_id: str) -> Dict[str, Any]:
+        """Look up and cache one tweet's metrics through the batcher."""
+        metrics = await self._metrics_batcher.add_item(post_id)
+        if metrics is None:
+            raise PlatformError("Twitter API error: Tweet not found")
+        self._cache_metrics(post_id, metrics, time.monotonic())
+        return metrics
+    
+    async def get_metrics_batch(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get metrics for many tweets, `METRICS_BATCH_SIZE` per request.
+        
+        Cached metrics are reused; only the misses are looked up, with
+        one request per chunk sent concurrently. If any lookup fails the
+        others are cancelled and its error is raised.
+        
+        Args:
+            post_ids: Tweet IDs
+            
+        Returns:
+            Metrics in the same order as `post_ids`; empty for tweets that
+            were not found
+        """
+        now = time.monotonic()
+        found: Dict[str, Dict[str, Any]] = {}
+        misses = []
+        for post_id in post_ids:
+            metrics = self._cached_metrics(post_id, now)
+            if metrics is None:
+                misses.append(post_id)
+            else:
+                found[post_id] = metrics
+        
+        misses = list(dict.fromkeys(misses))
+        try:
+            async with asyncio.TaskGroup() as group:
+                lookups = [
+                    group.create_task(self._lookup_metrics(
+                        misses[start:start + METRICS_BATCH_SIZE]
+                    ))
+                    for start in range(0, len(misses), METRICS_BATCH_SIZE)
+                ]
+        except ExceptionGroup as e:
+            # Callers expect the PlatformError itself, not a group
+            raise e.exceptions[0] from None
+        
+        fetched_at = time.monotonic()
+        for lookup in lookups:
+            fetched = lookup.result()
+            for post_id, metrics in fetched.items():
+                self._cache_metrics(post_id, metrics, fetched_at)
+            found.update(fetched)
+        return [dict(found.get(post_id, {})) for post_id in post_ids]
@@ -1,6 +1,6 @@
 import random
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 class AdaptiveBackoffManager:
     """Manages retry backoff with adaptive strategies and jitter."""
@@ -12,8 +12,8 @@ class AdaptiveBackoffManager:
             base_delay: Initial delay between retries
             max_delay: Maximum delay between retries
         """
-        self.base_delay = base_delay
-        self.max_delay = max_delay
+        self._base_delay = base_delay
+        self._max_delay = max_delay
         self.success_streak = 0
         self.failure_streak = 0
         self.jitter_factor = 0.1
@@ -22,6 +22,42 @@ class AdaptiveBackoffManager:
         self.last_backoff: Optional[float] = None
         self._min_jitter = 0.01
         self._max_jitter = 0.5
+        self._rng = random.Random()
+        self._delays = self._build_delay_table(base_delay, max_delay)
+    
+    @property
+    def base_delay(self) -> float:
+        """Initial delay between retries."""
+        return self._base_delay
+    
+    @base_delay.setter
+    def base_delay(self, value: float) -> None:
+        self._base_delay = value
+        self._delays = self._build_delay_table(value, self._max_delay)
+    
+    @property
+    def max_delay(self) -> float:
+        """Maximum delay between retries."""
+        return self._max_delay
+    
+    @max_delay.setter
+    def max_delay(self, value: float) -> None:
+        self._max_delay = value
+        self._delays = self._build_delay_table(self._base_delay, value)
+    
+    @staticmethod
+    def _build_delay_table(base_delay: float, max_delay: float) -> List[float]:
+        """Precompute ``min(base_delay * 2**attempt, max_delay)`` per attempt.
+        
+        The last entry is the cap and applies to every later attempt.
+        """
+        delays = []
+        delay = base_delay
+        while 0 < delay < max_delay:
+            delays.append(delay)
+            delay *= 2  # Exact in floating point, so matches 2**attempt
+        delays.append(min(delay, max_delay))
+        return delays
     
     def add_jitter(self, delay: float) -> float:
         """Add randomized jitter to delay.
@@ -32,8 +68,8 @@ class AdaptiveBackoffManager:
         Returns:
             Delay with jitter added
         """
-        jitter = delay * self.jitter_factor
-        return delay + random.uniform(-jitter, jitter)
+        # random() skips uniform()'s argument handling: 2r - 1 is in [-1, 1)
+        return delay * (1.0 + self.jitter_factor * (2.0 * self._rng.random() - 1.0))
     
     def get_delay(self, attempt: int, error_type: Optional[str] = None) -> float:
         """Calculate delay with exponential backoff and jitter.
@@ -45,32 +81,37 @@ class AdaptiveBackoffManager:
         Returns:
             Delay in seconds
         """
-        # Track error types
-        if error_type:
-            self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
+        # Hot path: read attributes once into locals
+        max_delay = self._max_delay
         
         # Base exponential backoff
-        delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        delays = self._delays
+        delay = delays[attempt] if attempt < len(delays) else delays[-1]
         
-        # Adjust based on error type and history
-        if error_type == "rate_limit":
-            # Increase delay more aggressively for rate limits
-            rate_limit_count = self.error_counts.get("rate_limit", 0)
-            if rate_limit_count > 3:
-                delay = min(delay * 2.0, self.max_delay)  # Double delay for persistent rate limits
-            else:
-                delay = min(delay * 1.5, self.max_delay)  # 50% increase for initial rate limits
-        elif error_type == "timeout":
-            # Moderate increase for timeouts
-            timeout_count = self.error_counts.get("timeout", 0)
-            if timeout_count > 3:
-                delay = min(delay * 1.5, self.max_delay)
+        # Track error types and adjust based on their history
+        if error_type:
+            error_counts = self.error_counts
+            count = error_counts.get(error_type, 0) + 1
+            error_counts[error_type] = count
+            if error_type == "rate_limit":
+                # Increase delay more aggressively for rate limits: double it
+                # for persistent rate limits, 50% more for initial ones
+                delay *= 2.0 if count > 3 else 1.5
+            elif error_type == "timeout" and count > 3:
+                # Moderate increase for persistent timeouts
+                delay *= 1.5
+            if delay > max_delay:
+                delay = max_delay
         
         # Apply jitter
         final_delay = self.add_jitter(delay)
         
-        # Ensure delay is within bounds
-        final_delay = max(self.base_delay * 0.5, min(final_delay, self.max_delay))
+        # Ensure delay is within bounds; comparisons avoid min()/max() calls
+        if final_delay > max_delay:
+            final_delay = max_delay
+        floor = self._base_delay * 0.5
+        if final_delay < floor:
+            final_delay = floor
         
         self.delay_history.append(final_delay)
         self.last_backoff = final_delay
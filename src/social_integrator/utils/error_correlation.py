@@ -1,10 +1,18 @@
+import sys
 import time
-from typing import Dict, List, Optional, Tuple, Set
-from collections import defaultdict
+from typing import Counter, Deque, Dict, List, Optional, Tuple, Set
+import collections
 
 class ErrorCorrelationAnalyzer:
     """Analyzes error patterns to detect correlated failures."""
     
+    __slots__ = (
+        "window_size", "error_window", "error_patterns", "correlation_scores",
+        "error_counts", "_window_counts", "_cleanup_threshold", "_prev_error",
+        "_pattern_total", "_pattern_repeated", "_score_cache", "_patterns_cache",
+        "_error_total",
+    )
+    
     def __init__(self, window_size: int = 10):
         """Initialize analyzer.
         
@@ -12,16 +20,33 @@ class ErrorCorrelationAnalyzer:
             window_size: Maximum number of errors to track
         """
         self.window_size = window_size
-        self.error_window: List[Tuple[str, float]] = []
-        self.error_patterns: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.error_window: Deque[Tuple[str, float]] = collections.deque(maxlen=window_size)
+        self.error_patterns: Counter[Tuple[str, str]] = collections.Counter()
         self.correlation_scores: List[float] = []
-        self.error_counts: Dict[str, int] = defaultdict(int)
+        self.error_counts: Counter[str] = collections.Counter()
+        self._error_total = 0
+        self._window_counts: Counter[str] = collections.Counter()
         self._cleanup_threshold = 3600  # 1 hour in seconds
+        self._prev_error: Optional[str] = None
+        self._pattern_total = 0
+        self._pattern_repeated = 0
+        # Derived results, recomputed only after add_error
+        self._score_cache: Optional[float] = None
+        self._patterns_cache: Optional[Dict[Tuple[str, str], float]] = None
     
     def _cleanup_old_errors(self, current_time: float) -> None:
         """Remove errors older than cleanup threshold."""
         cutoff = current_time - self._cleanup_threshold
-        self.error_window = [(e, t) for e, t in self.error_window if t > cutoff]
+        while self.error_window and self.error_window[0][1] <= cutoff:
+            self._forget(self.error_window.popleft()[0])
+        if not self.error_window:
+            self._prev_error = None
+    
+    def _forget(self, error_type: str) -> None:
+        """Drop an error that left the window from the rolling counts."""
+        self._window_counts[error_type] -= 1
+        if not self._window_counts[error_type]:
+            del self._window_counts[error_type]
     
     def add_error(self, error_type: str, timestamp: float) -> None:
         """Add error to window and analyze patterns.
@@ -30,22 +55,28 @@ class ErrorCorrelationAnalyzer:
             error_type: Type of error
             timestamp: Time of error occurrence
         """
+        # Interned keys let dict lookups short-circuit on identity
+        error_type = sys.intern(error_type)
         self._cleanup_old_errors(timestamp)
         
-        # Add to window
+        # Add to window; the deque evicts the oldest entry once full
+        if len(self.error_window) == self.window_size:
+            self._forget(self.error_window[0][0])
         self.error_window.append((error_type, timestamp))
-        if len(self.error_window) > self.window_size:
-            self.error_window.pop(0)
+        self._window_counts[error_type] += 1
         
         # Update error counts
         self.error_counts[error_type] += 1
-        
-        # Analyze patterns
-        if len(self.error_window) >= 2:
-            # Look at consecutive errors
-            for i in range(len(self.error_window) - 1):
-                pattern = (self.error_window[i][0], self.error_window[i + 1][0])
-                self.error_patterns[pattern] += 1
+        self._error_total += 1
+        
+        # Count the pattern formed with the previous error
+        if self._prev_error is not None:
+            self.error_patterns[(self._prev_error, error_type)] += 1
+            self._pattern_total += 1
+            self._pattern_repeated += self._prev_error == error_type
+            self._score_cache = None
+            self._patterns_cache = None
+        self._prev_error = error_type
     
     def get_correlation_score(self) -> float:
         """Calculate error correlation score.
@@ -53,27 +84,21 @@ class ErrorCorrelationAnalyzer:
         Returns:
             Score between 0 and 1, where higher values indicate stronger correlation
         """
-        if not self.error_patterns:
-            return 0.0
-        
-        total_patterns = sum(self.error_patterns.values())
-        if total_patterns == 0:
+        if not self._pattern_total:
             return 0.0
         
-        # Calculate repeated patterns (same error type in sequence)
-        repeated_patterns = sum(
-            count for (error1, error2), count in self.error_patterns.items()
-            if error1 == error2
-        )
+        if self._score_cache is not None:
+            self.correlation_scores.append(self._score_cache)
+            return self._score_cache
         
-        # Calculate pattern strength
-        unique_patterns = len(set(self.error_patterns.keys()))
-        pattern_ratio = 1.0 / unique_patterns if unique_patterns > 0 else 0.0
+        # Pattern strength from the number of distinct patterns
+        pattern_ratio = 1.0 / len(self.error_patterns)
         
-        # Combine metrics
-        correlation = (repeated_patterns / total_patterns) + pattern_ratio
+        # Combine with the share of repeated patterns (same error in sequence)
+        correlation = (self._pattern_repeated / self._pattern_total) + pattern_ratio
         normalized_score = min(1.0, correlation / 2.0)
         
+        self._score_cache = normalized_score
         self.correlation_scores.append(normalized_score)
         return normalized_score
     
@@ -83,29 +108,30 @@ class ErrorCorrelationAnalyzer:
         Returns:
             Most frequent error type or None if no errors
         """
-        if not self.error_window:
+        if not self._window_counts:
             return None
         
-        error_counts: Dict[str, int] = defaultdict(int)
-        for error_type, _ in self.error_window:
-            error_counts[error_type] += 1
-        
-        return max(error_counts.items(), key=lambda x: x[1])[0]
+        return self._window_counts.most_common(1)[0][0]
     
     def get_error_patterns(self) -> Dict[Tuple[str, str], float]:
         """Get error pattern frequencies.
         
+        The same dictionary is returned until another error is added;
+        callers must not mutate it.
+        
         Returns:
             Dictionary mapping error patterns to their frequencies
         """
-        total_patterns = sum(self.error_patterns.values())
+        total_patterns = self._pattern_total
         if total_patterns == 0:
             return {}
         
-        return {
-            pattern: count / total_patterns
-            for pattern, count in self.error_patterns.items()
-        }
+        if self._patterns_cache is None:
+            self._patterns_cache = {
+                pattern: count / total_patterns
+                for pattern, count in self.error_patterns.items()
+            }
+        return self._patterns_cache
     
     def get_error_distribution(self) -> Dict[str, float]:
         """Get distribution of error types.
@@ -113,7 +139,7 @@ class ErrorCorrelationAnalyzer:
         Returns:
             Dictionary mapping error types to their frequencies
         """
-        total_errors = sum(self.error_counts.values())
+        total_errors = self._error_total
         if total_errors == 0:
             return {}
         
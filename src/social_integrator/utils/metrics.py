@@ -1,23 +1,64 @@
+import sys
 import time
-from typing import Dict, Any, Optional, List
+from typing import Counter, DefaultDict, Deque, Dict, Any, Optional
 from collections import defaultdict
+import collections
+
+class _RequestStats:
+    """Running response time and retry totals for one request."""
+    
+    __slots__ = ("sum", "n", "retries")
+    
+    def __init__(self) -> None:
+        self.sum = 0.0
+        self.n = 0
+        self.retries = 0  # Highest retry count seen
 
 class RetryMetricsCollector:
     """Collects and analyzes retry-related metrics."""
     
-    def __init__(self):
-        """Initialize metrics collector."""
+    __slots__ = (
+        "retry_counts", "_stats", "error_types", "total_requests",
+        "total_attempts", "failed_requests", "retry_intervals",
+        "consecutive_failures", "_last_success_ns", "_request_history",
+        "_max_retry_sum", "_per_req_avg_sum",
+        "_interval_sum", "_metrics_cache",
+    )
+    
+    def __init__(self, interval_capacity: int = 4096, max_history: Optional[int] = 10_000):
+        """Initialize metrics collector.
+        
+        Args:
+            interval_capacity: Number of most recent retry intervals to keep
+            max_history: Number of most recent attempts to keep in the request
+                history (None keeps all, 0 disables the history)
+        """
         self.retry_counts: Dict[str, int] = {}
-        self.response_times: Dict[str, List[float]] = defaultdict(list)
-        self.error_types: Dict[str, int] = defaultdict(int)
+        self.error_types: Counter[str] = collections.Counter()
         self.total_requests = 0
         self.total_attempts = 0
         self.failed_requests = 0
-        self.retry_intervals: List[float] = []
+        self.retry_intervals: Deque[float] = collections.deque(maxlen=interval_capacity)
         self.consecutive_failures = 0
-        self.last_success_time: Optional[float] = None
-        self._request_history: List[Dict[str, Any]] = []
-        self._max_retry_per_request: Dict[str, int] = {}
+        self._last_success_ns: Optional[int] = None
+        # Only used for recency queries; aggregates come from running sums
+        self._request_history: Optional[Deque[Dict[str, Any]]] = None
+        if max_history != 0:
+            self._request_history = collections.deque(maxlen=max_history)
+        self._stats: DefaultDict[str, _RequestStats] = defaultdict(_RequestStats)
+        # Running aggregates so get_metrics never rescans history
+        self._max_retry_sum = 0
+        self._per_req_avg_sum = 0.0
+        self._interval_sum = 0.0
+        # Metrics computed by get_metrics, dropped on every mutation
+        self._metrics_cache: Optional[Dict[str, Any]] = None
+    
+    @property
+    def last_success_time(self) -> Optional[float]:
+        """Get the time.monotonic() reading of the last success, if any."""
+        if self._last_success_ns is None:
+            return None
+        return self._last_success_ns / 1e9
     
     def record_attempt(
         self,
@@ -34,27 +75,38 @@ class RetryMetricsCollector:
             error_type: Type of error if failed
             retry_count: Number of retries for this request
         """
+        if error_type:
+            error_type = sys.intern(error_type)
+        
+        is_new_request = request_id not in self._stats
+        stats = self._stats[request_id]
+        
         # Update retry count for the request
-        self._max_retry_per_request[request_id] = max(
-            self._max_retry_per_request.get(request_id, 0),
-            retry_count
-        )
+        if retry_count > stats.retries:
+            self._max_retry_sum += retry_count - stats.retries
+            stats.retries = retry_count
         self.retry_counts[request_id] = retry_count
         
-        self.response_times[request_id].append(response_time)
+        # Update the running mean for this request
+        prev_avg = stats.sum / stats.n if stats.n else 0.0
+        stats.sum += response_time
+        stats.n += 1
+        self._per_req_avg_sum += stats.sum / stats.n - prev_avg
         
         # Record in history
-        self._request_history.append({
-            'request_id': request_id,
-            'response_time': response_time,
-            'error_type': error_type,
-            'retry_count': retry_count,
-            'timestamp': time.monotonic()
-        })
+        if self._request_history is not None:
+            self._request_history.append({
+                'request_id': request_id,
+                'response_time': response_time,
+                'error_type': error_type,
+                'retry_count': retry_count,
+                'timestamp': time.monotonic()
+            })
         
         # Update counters
+        self._metrics_cache = None
         self.total_attempts += 1
-        if request_id not in self.response_times or len(self.response_times[request_id]) == 1:
+        if is_new_request:
             self.total_requests += 1
         
         if error_type:
@@ -63,7 +115,7 @@ class RetryMetricsCollector:
             self.consecutive_failures += 1
         else:
             self.consecutive_failures = 0
-            self.last_success_time = time.monotonic()
+            self._last_success_ns = time.monotonic_ns()
     
     def record_retry_interval(self, interval: float) -> None:
         """Record time between retries.
@@ -71,14 +123,38 @@ class RetryMetricsCollector:
         Args:
             interval: Time between attempts in seconds
         """
+        if len(self.retry_intervals) == self.retry_intervals.maxlen:
+            self._interval_sum -= self.retry_intervals[0]
         self.retry_intervals.append(interval)
+        self._interval_sum += interval
+        self._metrics_cache = None
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics.
         
+        Aggregates are recomputed only after new data is recorded; every
+        call still returns a new dictionary the caller may keep or modify.
+        
         Returns:
             Dictionary of metrics
         """
+        cache = self._metrics_cache
+        if cache is None:
+            cache = self._metrics_cache = self._compute_metrics()
+        
+        # Time since last success depends on the clock, so it is never cached
+        time_since_success = None
+        if self._last_success_ns is not None:
+            time_since_success = (time.monotonic_ns() - self._last_success_ns) / 1e9
+        
+        return {
+            **cache,
+            "error_distribution": dict(cache["error_distribution"]),
+            "time_since_last_success": time_since_success
+        }
+    
+    def _compute_metrics(self) -> Dict[str, Any]:
+        """Compute the metrics that only change when data is recorded."""
         # Calculate success rate based on total attempts
         success_rate = 1.0
         if self.total_attempts > 0:
@@ -86,27 +162,18 @@ class RetryMetricsCollector:
         
         # Calculate average retries per request using max retries per request
         avg_retries = 0.0
-        if self._max_retry_per_request:
-            avg_retries = sum(self._max_retry_per_request.values()) / len(self._max_retry_per_request)
+        if self._stats:
+            avg_retries = self._max_retry_sum / len(self._stats)
         
-        # Calculate average response time
+        # Calculate average response time as the mean of per-request means
         avg_response_time = 0.0
-        if self.response_times:
-            total_time = sum(
-                sum(times) / len(times)
-                for times in self.response_times.values()
-            )
-            avg_response_time = total_time / len(self.response_times)
+        if self._stats:
+            avg_response_time = self._per_req_avg_sum / len(self._stats)
         
         # Calculate average retry interval
         avg_retry_interval = 0.0
         if self.retry_intervals:
-            avg_retry_interval = sum(self.retry_intervals) / len(self.retry_intervals)
-        
-        # Calculate time since last success
-        time_since_success = None
-        if self.last_success_time:
-            time_since_success = time.monotonic() - self.last_success_time
+            avg_retry_interval = self._interval_sum / len(self.retry_intervals)
         
         return {
             "success_rate": success_rate,
@@ -115,7 +182,6 @@ class RetryMetricsCollector:
             "error_distribution": dict(self.error_types),
             "avg_retry_interval": avg_retry_interval,
             "consecutive_failures": self.consecutive_failures,
-            "time_since_last_success": time_since_success,
             "total_requests": self.total_requests,
             "total_attempts": self.total_attempts,
             "failed_requests": self.failed_requests
@@ -144,11 +210,23 @@ class RetryMetricsCollector:
         """
         retry_dist: Dict[int, int] = defaultdict(int)
         # Initialize with zero for all retry counts up to max
-        max_retries = max(self._max_retry_per_request.values(), default=0)
+        max_retries = max((s.retries for s in self._stats.values()), default=0)
         for i in range(max_retries + 1):
             retry_dist[i] = 0
             
         # Count actual retry occurrences
-        for count in self._max_retry_per_request.values():
-            retry_dist[count] += 1
+        for stats in self._stats.values():
+            retry_dist[stats.retries] += 1
         return dict(retry_dist)
+    
+    def get_response_time_means(self) -> Dict[str, float]:
+        """Get the mean response time of each request.
+        
+        Returns:
+            Dictionary mapping request IDs to their mean response time in
+            seconds
+        """
+        return {
+            request_id: stats.sum / stats.n
+            for request_id, stats in self._stats.items()
+        }
@@ -1,10 +1,12 @@
+import array
 import asyncio
 import time
 import functools
-import json
+import math
 import os
 from abc import ABC, abstractmethod
-from typing import Optional, Any, Callable, TypeVar, ParamSpec, List, Dict, Generic, AsyncIterator, Protocol
+from typing import Optional, Any, Callable, TypeVar, ParamSpec, List, Dict, Generic, AsyncIterator, Protocol, Tuple
+import msgpack  # type: ignore[import-untyped]
 from ..core.platform import RateLimitError
 
 P = ParamSpec('P')
@@ -23,35 +25,98 @@ class RateLimitStorage(Protocol):
         """Load rate limiter state."""
         ...
 
+# Leading byte of every state file, bumped whenever the encoding changes
+_STATE_FORMAT_VERSION = 1
+
 class FileRateLimitStorage:
-    """File-based rate limit storage."""
+    """File-based rate limit storage.
+
+    State is stored as msgpack behind a one-byte format version. Saves are
+    buffered in memory and written out by a background flush at
+    most every ``flush_interval`` seconds, so a burst of saves costs one
+    write per key. Loads see buffered state immediately.
+    """
     
-    def __init__(self, directory: str = ".rate_limits"):
+    def __init__(self, directory: str = ".rate_limits", flush_interval: float = 0.1):
+        """Initialize storage.
+
+        Args:
+            directory: Directory holding one state file per key
+            flush_interval: Seconds between background flushes
+        """
         self.directory = directory
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task[None]] = None
         os.makedirs(directory, exist_ok=True)
     
     def _get_path(self, key: str) -> str:
-        return os.path.join(self.directory, f"{key}.json")
+        return os.path.join(self.directory, f"{key}.msgpack")
+
+    def _write(self, key: str, state: Dict[str, Any]) -> None:
+        """Atomically replace the state file for `key`."""
+        path = self._get_path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(bytes((_STATE_FORMAT_VERSION,)))
+            f.write(msgpack.packb(state, use_bin_type=True))
+        os.replace(tmp_path, path)
+
+    async def _flush_loop(self) -> None:
+        """Write buffered state periodically until nothing is pending."""
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered state to disk."""
+        pending, self._pending = self._pending, {}
+        for key, state in pending.items():
+            self._write(key, state)
     
     async def save_state(self, key: str, state: Dict[str, Any]) -> None:
-        """Save rate limiter state to file."""
-        path = self._get_path(key)
-        async with asyncio.Lock():
-            with open(path, 'w') as f:
-                json.dump(state, f)
+        """Buffer rate limiter state for the next flush."""
+        self._pending[key] = state
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
     
     async def load_state(self, key: str) -> Optional[Dict[str, Any]]:
-        """Load rate limiter state from file."""
+        """Load rate limiter state, preferring not-yet-flushed saves."""
+        if key in self._pending:
+            return self._pending[key]
         path = self._get_path(key)
         try:
-            async with asyncio.Lock():
-                with open(path) as f:
-                    return json.load(f)
+            with open(path, 'rb') as f:
+                data = f.read()
         except FileNotFoundError:
             return None
+        if not data or data[0] != _STATE_FORMAT_VERSION:
+            # Written in a format this version cannot read; start fresh
+            return None
+        return msgpack.unpackb(data[1:], raw=False)
+
+    async def close(self) -> None:
+        """Stop background flushing and write any buffered state."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
 
 class RateLimiter:
-    """Token bucket rate limiter."""
+    """Sliding window rate limiter.
+
+    Allows at most ``calls`` requests in any window of ``period`` seconds.
+    Subclasses can swap the accounting by overriding ``_init_window``,
+    ``_usage``, ``_consume``, ``_retry_after`` and the
+    ``_export_state``/``_import_state`` pair.
+    """
+    
+    # Clock all request times are read from; tests can swap in a fake one
+    time_func: Callable[[], float] = staticmethod(time.monotonic)
     
     def __init__(
         self,
@@ -73,23 +138,27 @@ class RateLimiter:
         if period <= 0:
             raise ValueError("period must be positive")
             
-        self.calls = calls
-        self.period = period
-        self.key = key or f"rate_limiter_{id(self)}"
-        self.storage = storage
+        self.calls: int = calls
+        self.period: float = period
+        self.key: str = key or f"rate_limiter_{id(self)}"
+        self.storage: Optional[RateLimitStorage] = storage
         
-        self._request_times: List[float] = []
-        self._lock = asyncio.Lock()
+        self._init_window()
         
         # Metrics
-        self._total_requests = 0
-        self._total_throttled = 0
-        self._last_reset = time.monotonic()
-        self._max_concurrent = 0
-        self._closed = False
+        self._total_requests: int = 0
+        self._total_throttled: int = 0
+        self._last_reset: float = self.time_func()
+        self._max_concurrent: int = 0
+        self._closed: bool = False
+        # Set on close so waiters wake immediately instead of sleeping out
+        # their retry delay
+        self._closed_event: asyncio.Event = asyncio.Event()
         
         # Initialize state loading
-        self._load_task = asyncio.create_task(self._load_state()) if storage else None
+        self._load_task: Optional[asyncio.Task[None]] = (
+            asyncio.create_task(self._load_state()) if storage else None
+        )
 
     async def _load_state(self) -> None:
         """Load persisted state if available."""
@@ -98,17 +167,12 @@ class RateLimiter:
             
         state = await self.storage.load_state(self.key)
         if state:
-            async with self._lock:
-                now = time.monotonic()
-                # Only load requests still within window
-                self._request_times = [
-                    t for t in state.get('request_times', [])
-                    if t > (now - self.period)
-                ]
-                self._total_requests = state.get('total_requests', 0)
-                self._total_throttled = state.get('total_throttled', 0)
-                self._max_concurrent = state.get('max_concurrent', 0)
-                self._last_reset = state.get('last_reset', now)
+            now = self.time_func()
+            self._import_state(state, now)
+            self._total_requests = state.get('total_requests', 0)
+            self._total_throttled = state.get('total_throttled', 0)
+            self._max_concurrent = state.get('max_concurrent', 0)
+            self._last_reset = state.get('last_reset', now)
 
     async def _save_state(self) -> None:
         """Save current state."""
@@ -116,7 +180,7 @@ class RateLimiter:
             return
             
         state = {
-            'request_times': self._request_times,
+            **self._export_state(),
             'total_requests': self._total_requests,
             'total_throttled': self._total_throttled,
             'max_concurrent': self._max_concurrent,
@@ -124,52 +188,71 @@ class RateLimiter:
         }
         await self.storage.save_state(self.key, state)
     
-    def _cleanup_old_requests(self, now: float) -> None:
-        """Remove requests outside the current window using sliding window."""
-        if not self._request_times:
-            return
-            
-        window_start = now - self.period
-        
-        # Binary search for the first valid request
-        left, right = 0, len(self._request_times)
-        while left < right:
-            mid = (left + right) // 2
-            if self._request_times[mid] <= window_start:
-                left = mid + 1
+    def _init_window(self) -> None:
+        """Set up empty accounting state for a limiter with no requests."""
+        # Ring buffer of the last `calls` request times; `_head` is the
+        # oldest slot and unused slots hold -inf so they count as expired
+        self._request_times: array.array = array.array('d', [-math.inf]) * self.calls
+        self._head: int = 0
+
+    def _export_state(self) -> Dict[str, Any]:
+        """Get the algorithm-specific part of the persisted state."""
+        ring, head = self._request_times, self._head
+        times = ring[head:] + ring[:head]
+        return {'request_times': times[self._expired(-math.inf):].tolist()}
+
+    def _import_state(self, state: Dict[str, Any], now: float) -> None:
+        """Restore state written by `_export_state`."""
+        self._init_window()
+        # Only load requests still within window
+        for t in state.get('request_times', [])[-self.calls:]:
+            if t > (now - self.period):
+                self._consume(t)
+
+    def _expired(self, cutoff: float) -> int:
+        """Count slots at or before `cutoff`, oldest first."""
+        # Slots are in time order starting at `_head`, so binary search the
+        # rotated buffer instead of scanning it
+        ring, head, calls = self._request_times, self._head, self.calls
+        lo, hi = 0, calls
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ring[(head + mid) % calls] <= cutoff:
+                lo = mid + 1
             else:
-                right = mid
-        
-        if left > 0:
-            self._request_times = self._request_times[left:]
+                hi = mid
+        return lo
+
+    def _usage(self, now: float) -> int:
+        """Get the number of requests counted against the limit as of `now`."""
+        return self.calls - self._expired(now - self.period)
+
+    def _consume(self, now: float) -> None:
+        """Count a granted request."""
+        self._request_times[self._head] = now
+        self._head = (self._head + 1) % self.calls
     
     @property
     def retry_after(self) -> float:
         """Get time until next token is available."""
-        if not self._request_times:
-            return 0
-        
-        now = time.monotonic()
-        self._cleanup_old_requests(now)
-        
-        if len(self._request_times) < self.calls:
-            return 0
-        
-        # Use sliding window to calculate exact wait time
-        window_start = now - self.period
-        oldest_request = self._request_times[0]
-        
-        # Calculate the exact time when a slot will be available
-        time_until_slot = oldest_request - window_start
+        return self._retry_after(self.time_func())
+    
+    def _retry_after(self, now: float, tokens: int = 1) -> float:
+        """Get time until `tokens` tokens are available as of `now`."""
+        expired = self._expired(now - self.period)
+        shortfall = tokens - expired
+        if shortfall <= 0:
+            return 0.0
         
-        # Add small buffer to prevent race conditions
-        return max(0.001, time_until_slot)
+        # Slots free up as requests leave the window oldest first, so wait
+        # for the one that covers the shortfall; add small buffer to
+        # prevent race conditions
+        request = self._request_times[(self._head + expired + shortfall - 1) % self.calls]
+        return max(0.001, request + self.period - now)
     
     def get_current_capacity(self) -> int:
         """Get number of available tokens."""
-        now = time.monotonic()
-        self._cleanup_old_requests(now)
-        return max(0, self.calls - len(self._request_times))
+        return max(0, self.calls - self._usage(self.time_func()))
     
     async def wait_for_token(self, timeout: Optional[float] = None) -> bool:
         """Wait for a token to become available.
@@ -187,33 +270,42 @@ class RateLimiter:
         if self._closed:
             raise RuntimeError("Rate limiter is closed")
             
-        start_time = time.monotonic()
+        deadline = None if timeout is None else self.time_func() + timeout
         
         while True:
             try:
                 await self.acquire()
                 return True
             except RateLimitError as e:
-                if timeout is not None:
-                    remaining = timeout - (time.monotonic() - start_time)
+                wait_time = e.retry_after or 0.0
+                if deadline is not None:
+                    remaining = deadline - self.time_func()
                     if remaining <= 0:
                         return False
-                    wait_time = min(e.retry_after, remaining)
-                else:
-                    wait_time = e.retry_after
-                    
-                await asyncio.sleep(wait_time)
-            except RuntimeError:
-                # Re-raise if limiter was closed while waiting
-                raise
+                    wait_time = min(wait_time, remaining)
+                
+                # Sleep until the next slot frees up, or until close() so
+                # the acquire below reports it right away
+                try:
+                    async with asyncio.timeout(wait_time):
+                        await self._closed_event.wait()
+                except TimeoutError:
+                    pass
     
-    async def acquire(self) -> None:
-        """Acquire a token, waiting if necessary.
+    async def acquire(self, tokens: int = 1) -> None:
+        """Acquire tokens, all or none.
+        
+        Args:
+            tokens: Number of tokens to take at once
         
         Raises:
+            ValueError: If `tokens` is not between 1 and ``calls``
             RuntimeError: If rate limiter is closed
-            RateLimitError: If rate limit is exceeded
+            RateLimitError: If fewer than `tokens` tokens are available;
+                ``retry_after`` covers the whole shortfall
         """
+        if not 1 <= tokens <= self.calls:
+            raise ValueError(f"tokens must be between 1 and {self.calls}")
         if self._closed:
             raise RuntimeError("Rate limiter is closed")
             
@@ -222,46 +314,63 @@ class RateLimiter:
             await self._load_task
             self._load_task = None  # Only load once
         
-        async with self._lock:
-            now = time.monotonic()
-            self._cleanup_old_requests(now)
-            
-            # Count the request before checking limits
-            self._total_requests += 1
-            current_requests = len(self._request_times)
-            self._max_concurrent = max(self._max_concurrent, current_requests)
-            
-            if current_requests >= self.calls:
-                self._total_throttled += 1
-                # Save state on throttle if storage is used
-                if self.storage:
-                    await self._save_state()
-                retry_after = self.retry_after
-                raise RateLimitError(
-                    f"Rate limit exceeded. Retry after {retry_after:.2f}s",
-                    retry_after=retry_after
-                )
-            
-            self._request_times.append(now)
-            
-            # Periodically save state if storage is used
-            if self.storage and self._total_requests % 100 == 0:
+        # The check and the consume run without awaiting in between, so
+        # concurrent acquires on the loop cannot interleave and no lock is
+        # needed; state is only saved after the decision is made
+        now = self.time_func()
+        
+        # Count the request before checking limits
+        self._total_requests += 1
+        current_requests = self._usage(now)
+        self._max_concurrent = max(self._max_concurrent, current_requests)
+        
+        if current_requests + tokens > self.calls:
+            self._total_throttled += 1
+            retry_after = self._retry_after(now, tokens)
+            # Save state on throttle if storage is used
+            if self.storage:
                 await self._save_state()
+            raise RateLimitError(
+                f"Rate limit exceeded. Retry after {retry_after:.2f}s",
+                retry_after=retry_after
+            )
+        
+        for _ in range(tokens):
+            self._consume(now)
+        
+        # Periodically save state if storage is used
+        if self.storage and self._total_requests % 100 == 0:
+            await self._save_state()
 
-    async def close(self) -> None:
-        """Close the rate limiter and save final state."""
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """Close the rate limiter and save final state.
+        
+        Args:
+            timeout: Deadline in seconds shared by loading, saving and
+                flushing state; None waits indefinitely
+        
+        Raises:
+            TimeoutError: If persisting state missed the deadline; the
+                limiter is closed regardless
+        """
         if self._closed:
             return
             
         try:
-            if self._load_task is not None:
-                await self._load_task
-            if self.storage:
-                await self._save_state()
+            async with asyncio.timeout(timeout):
+                if self._load_task is not None:
+                    await self._load_task
+                if self.storage:
+                    await self._save_state()
+                    # Buffered storages hold saves in memory; persist ours now
+                    flush = getattr(self.storage, "flush", None)
+                    if flush is not None:
+                        await flush()
         finally:
             self._closed = True
+            self._closed_event.set()
 
-    async def get_metrics(self) -> dict:
+    async def get_metrics(self) -> Dict[str, Any]:
         """Get rate limiter metrics.
         
         Returns:
@@ -285,16 +394,14 @@ class RateLimiter:
             await self._load_task
             self._load_task = None
             
-        now = time.monotonic()
-        self._cleanup_old_requests(now)
-        
-        current = len(self._request_times)
+        now = self.time_func()
+        current = self._usage(now)
         return {
             "total_requests": self._total_requests,
             "total_throttled": self._total_throttled,
             "current_usage": current,
             "max_concurrent": self._max_concurrent,
-            "window_reset": self.retry_after,
+            "window_reset": self._retry_after(now),
             "utilization": (current / self.calls) * 100 if self.calls > 0 else 0,
             "is_closed": self._closed
         }
@@ -304,16 +411,84 @@ class RateLimiter:
         self._total_requests = 0
         self._total_throttled = 0
         self._max_concurrent = 0
-        self._last_reset = time.monotonic()
+        self._last_reset = self.time_func()
+
+class TokenBucketRateLimiter(RateLimiter):
+    """Token bucket rate limiter.
+
+    Holds up to ``calls`` tokens and refills them continuously at
+    ``calls / period`` per second, so capacity comes back gradually instead
+    of when the oldest request leaves the window. Each acquire is O(1) and
+    state is two floats regardless of traffic.
+    """
+
+    def __init__(
+        self,
+        calls: int,
+        period: float,
+        key: Optional[str] = None,
+        storage: Optional[RateLimitStorage] = None
+    ):
+        """Initialize rate limiter.
+        
+        Args:
+            calls: Bucket capacity and number of tokens refilled per period
+            period: Time period in seconds
+            key: Unique identifier for this rate limiter
+            storage: Storage backend for persistence
+        """
+        super().__init__(calls, period, key=key, storage=storage)
+
+    def _init_window(self) -> None:
+        self._tokens: float = float(self.calls)
+        self._last_refill: float = self.time_func()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(
+                self.calls, self._tokens + elapsed * self.calls / self.period
+            )
+            self._last_refill = now
+
+    def _export_state(self) -> Dict[str, Any]:
+        return {'tokens': self._tokens, 'last_refill': self._last_refill}
+
+    def _import_state(self, state: Dict[str, Any], now: float) -> None:
+        self._tokens = min(self.calls, state.get('tokens', self.calls))
+        self._last_refill = min(now, state.get('last_refill', now))
+        self._refill(now)
+
+    def _usage(self, now: float) -> int:
+        # Rounding up makes the limit bite as soon as less than one whole
+        # token is left
+        self._refill(now)
+        return max(0, math.ceil(self.calls - self._tokens))
+
+    def _consume(self, now: float) -> None:
+        self._tokens -= 1
+
+    def _retry_after(self, now: float, tokens: int = 1) -> float:
+        self._refill(now)
+        if self._tokens >= tokens:
+            return 0.0
+        return max(0.001, (tokens - self._tokens) * self.period / self.calls)
 
 class AsyncBatcher(Generic[ItemT, ResultT]):
-    """Batches async operations for efficient processing."""
+    """Batches async operations for efficient processing.
+
+    Full batches, and partial batches whose timeout expires, are handed to a
+    queue drained by ``concurrency`` worker tasks, so adding items never
+    waits on batch processing.
+    """
     
     def __init__(
         self,
         batch_size: int,
         batch_timeout: float,
-        process_func: Callable[[List[ItemT]], AsyncIterator[ResultT]]
+        process_func: Callable[[List[ItemT]], AsyncIterator[ResultT]],
+        concurrency: int = 1
     ):
         """Initialize batcher.
         
@@ -321,19 +496,21 @@ class AsyncBatcher(Generic[ItemT, ResultT]):
             batch_size: Maximum items per batch
             batch_timeout: Maximum time to wait for batch
             process_func: Function to process batches
+            concurrency: Number of batches processed at once
         """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout
         self.process_func = process_func
-        self.current_batch: List[ItemT] = []
-        self.batch_event = asyncio.Event()
-        self.results: Dict[int, ResultT] = {}
-        self.next_item_id = 0
-        self._lock = asyncio.Lock()
+        self.concurrency = concurrency
+        # Items of the batch being filled, each with the future for its result
+        self.current_batch: List[Tuple[ItemT, asyncio.Future]] = []
         self._closed = False
-        self._processor_task: Optional[asyncio.Task] = None
-        self._pending_batches: List[List[ItemT]] = []
-        self._item_futures: Dict[int, asyncio.Future] = {}
+        self._queue: asyncio.Queue[List[Tuple[ItemT, asyncio.Future]]] = asyncio.Queue()
+        self._workers: List[asyncio.Task[None]] = []
+        self._timeout_handle: Optional[asyncio.TimerHandle] = None
     
     async def add_item(self, item: ItemT) -> ResultT:
         """Add item to batch and wait for result.
@@ -349,83 +526,71 @@ class AsyncBatcher(Generic[ItemT, ResultT]):
         """
         if self._closed:
             raise RuntimeError("Batcher is closed")
-        
-        async with self._lock:
-            item_id = self.next_item_id
-            self.next_item_id += 1
-            self.current_batch.append(item)
-            
-            # Create future for this item
-            self._item_futures[item_id] = asyncio.Future()
-            
-            # Start processor if needed
-            if not self._processor_task or self._processor_task.done():
-                self._processor_task = asyncio.create_task(
-                    self._process_batches(),
-                    name=f"AsyncBatcher_{id(self)}"
-                )
-            
-            # Signal if batch is full
-            if len(self.current_batch) >= self.batch_size:
-                self._pending_batches.append(self.current_batch)
-                self.current_batch = []
-                self.batch_event.set()
-        
-        try:
-            # Wait for result
-            result = await self._item_futures[item_id]
-            if isinstance(result, Exception):
-                raise result
-            return result
-        finally:
-            # Cleanup
-            self._item_futures.pop(item_id, None)
-    
-    async def _process_batches(self) -> None:
-        """Process batches of items."""
-        while not self._closed or self.current_batch or self._pending_batches:
+
+        loop = asyncio.get_running_loop()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"AsyncBatcher_{id(self)}_{i}")
+                for i in range(self.concurrency)
+            ]
+
+        future: asyncio.Future = loop.create_future()
+        self.current_batch.append((item, future))
+        if len(self.current_batch) >= self.batch_size:
+            self._dispatch()
+        elif self._timeout_handle is None:
+            # First item of a new batch starts its timeout
+            self._timeout_handle = loop.call_later(self.batch_timeout, self._dispatch)
+
+        return await future
+
+    def flush(self) -> None:
+        """Hand the partial batch to the workers without waiting for its timeout."""
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand the batch being filled to the workers."""
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
+        if self.current_batch:
+            self._queue.put_nowait(self.current_batch)
+            self.current_batch = []
+
+    async def _worker(self) -> None:
+        """Process queued batches until cancelled."""
+        while True:
+            batch = await self._queue.get()
             try:
-                # Check current batch
-                async with self._lock:
-                    if self.current_batch:
-                        self._pending_batches.append(self.current_batch)
-                        self.current_batch = []
-                
-                # Wait for batch to fill or timeout
-                if not self._pending_batches:
-                    try:
-                        await asyncio.wait_for(
-                            self.batch_event.wait(),
-                            timeout=self.batch_timeout
-                        )
-                    except asyncio.TimeoutError:
-                        continue
-                    finally:
-                        self.batch_event.clear()
-                
-                # Process pending batches
-                while self._pending_batches:
-                    batch = self._pending_batches.pop(0)
-                    if not batch:
-                        continue
-                    
-                    try:
-                        item_id = self.next_item_id - len(batch)
-                        async for result in self.process_func(batch):
-                            if item_id in self._item_futures:
-                                self._item_futures[item_id].set_result(result)
-                            item_id += 1
-                    except Exception as e:
-                        # On error, fail all remaining items
-                        while item_id < self.next_item_id:
-                            if item_id in self._item_futures:
-                                self._item_futures[item_id].set_exception(e)
-                            item_id += 1
-            except Exception as e:
-                # Handle unexpected errors
-                for future in self._item_futures.values():
-                    if not future.done():
-                        future.set_exception(e)
+                await self._process_batch(batch)
+            finally:
+                self._queue.task_done()
+
+    async def _process_batch(self, batch: List[Tuple[ItemT, asyncio.Future]]) -> None:
+        """Run one batch and resolve its items' futures in order."""
+        futures = iter([future for _, future in batch])
+        try:
+            async for result in self.process_func([item for item, _ in batch]):
+                future = next(futures, None)
+                if future is None:
+                    break
+                if not future.done():
+                    future.set_result(result)
+        except asyncio.CancelledError:
+            # Batcher closed mid-batch; don't leave callers waiting
+            for future in futures:
+                if not future.done():
+                    future.set_exception(RuntimeError("Batcher closed"))
+            raise
+        except Exception as e:
+            # On error, fail all remaining items
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError("No result produced for item"))
     
     async def close(self) -> None:
         """Close batcher and process remaining items."""
@@ -433,20 +598,22 @@ class AsyncBatcher(Generic[ItemT, ResultT]):
             return
             
         self._closed = True
-        self.batch_event.set()
-        
-        if self._processor_task:
+        self._dispatch()
+
+        if self._workers:
             try:
-                await asyncio.wait_for(self._processor_task, timeout=self.batch_timeout)
-            except asyncio.TimeoutError:
-                self._processor_task.cancel()
-                try:
-                    await self._processor_task
-                except asyncio.CancelledError:
-                    pass
-            
-            # Fail any remaining items
-            for future in self._item_futures.values():
+                async with asyncio.timeout(self.batch_timeout):
+                    await self._queue.join()
+            except TimeoutError:
+                pass
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
+        # Fail any items still queued
+        while not self._queue.empty():
+            for _, future in self._queue.get_nowait():
                 if not future.done():
                     future.set_exception(RuntimeError("Batcher closed"))
 
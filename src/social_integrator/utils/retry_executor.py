@@ -0,0 +1,113 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+
+from ..core.platform import RateLimitError
+from .backoff import AdaptiveBackoffManager
+
+T = TypeVar('T')
+
+class RetryExecutor:
+    """Runs retryable operations through a bounded pool of queue workers.
+
+    Each worker retries its own operation with backoff, so a request that is
+    sleeping between attempts does not hold up the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        max_retries: int = 3,
+        backoff: Optional[AdaptiveBackoffManager] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (RateLimitError, asyncio.TimeoutError)
+    ):
+        """Initialize retry executor.
+
+        Args:
+            concurrency: Number of worker tasks
+            max_retries: Maximum attempts per operation
+            backoff: Backoff manager used to compute retry delays
+            retry_on: Exception types that trigger a retry
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        if max_retries <= 0:
+            raise ValueError("max_retries must be positive")
+
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff or AdaptiveBackoffManager()
+        self.retry_on = retry_on
+
+    @staticmethod
+    def _error_type(error: BaseException) -> Optional[str]:
+        """Map an exception to the backoff manager's error type."""
+        if isinstance(error, RateLimitError):
+            return "rate_limit"
+        if isinstance(error, asyncio.TimeoutError):
+            return "timeout"
+        return None
+
+    async def _run_with_retry(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run a single operation, retrying retryable errors with backoff."""
+        attempt = 0
+        while True:
+            try:
+                result = await operation()
+            except self.retry_on as e:
+                self.backoff.record_result(False)
+                attempt += 1
+                if attempt >= self.max_retries:
+                    raise
+
+                delay = self.backoff.get_delay(attempt - 1, self._error_type(e))
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after:
+                    delay = max(delay, retry_after)
+                await asyncio.sleep(delay)
+            else:
+                self.backoff.record_result(True)
+                return result
+
+    async def _worker(self, queue: asyncio.Queue, results: Dict[int, Any]) -> None:
+        """Consume operations from the queue until cancelled."""
+        while True:
+            index, operation = await queue.get()
+            try:
+                results[index] = await self._run_with_retry(operation)
+            except Exception as e:
+                results[index] = e
+            finally:
+                queue.task_done()
+
+    async def submit_many(
+        self,
+        operations: Iterable[Callable[[], Awaitable[T]]]
+    ) -> List[Union[T, Exception]]:
+        """Run operations concurrently with retries.
+
+        Args:
+            operations: Zero-argument callables returning a fresh awaitable
+                per attempt
+
+        Returns:
+            Results in submission order; operations that still failed after
+            retrying yield their final exception instead
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        results: Dict[int, Any] = {}
+        workers = [
+            asyncio.create_task(self._worker(queue, results))
+            for _ in range(self.concurrency)
+        ]
+
+        try:
+            count = 0
+            for count, operation in enumerate(operations, start=1):
+                await queue.put((count - 1, operation))
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return [results[i] for i in range(count)]
@@ -0,0 +1,82 @@
+import random
+import time
+from collections import deque
+from typing import Deque, List
+
+class AdaptiveThrottle:
+    """Client-side adaptive throttling.
+
+    Tracks how many requests the backend accepted over a rolling history and
+    rejects new requests locally with probability
+    ``max(0, (requests - k * accepts) / (requests + 1))``, so an overloaded
+    backend is not hit with requests it is likely to refuse.
+    """
+
+    def __init__(self, k: float = 2.0, history_time: float = 120.0):
+        """Initialize throttle.
+
+        Args:
+            k: Multiplier on accepts; lower values throttle more aggressively
+            history_time: Length of the rolling history in seconds
+        """
+        if k <= 0:
+            raise ValueError("k must be positive")
+        if history_time <= 0:
+            raise ValueError("history_time must be positive")
+
+        self.k = k
+        self.history_time = history_time
+        self.requests = 0
+        self.accepts = 0
+        self.local_rejects = 0
+        # Per-second buckets of [second, requests, accepts]
+        self._buckets: Deque[List[int]] = deque()
+        self._rng = random.Random()
+
+    def _expire(self, now: float) -> None:
+        """Drop buckets that fell out of the history window."""
+        cutoff = now - self.history_time
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            _, requests, accepts = self._buckets.popleft()
+            self.requests -= requests
+            self.accepts -= accepts
+
+    def _count(self, now: float, accepted: bool) -> None:
+        """Count a request in the bucket for the current second."""
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        self.requests += 1
+        if accepted:
+            bucket[2] += 1
+            self.accepts += 1
+
+    def reject_probability(self) -> float:
+        """Get the current local rejection probability."""
+        self._expire(time.monotonic())
+        return max(0.0, (self.requests - self.k * self.accepts) / (self.requests + 1))
+
+    def should_reject_locally(self) -> bool:
+        """Decide whether to drop a request before sending it.
+
+        Returns:
+            True if the request should be rejected without hitting the backend
+        """
+        probability = self.reject_probability()
+        if probability > 0 and self._rng.random() < probability:
+            self._count(time.monotonic(), accepted=False)
+            self.local_rejects += 1
+            return True
+        return False
+
+    def record(self, accepted: bool) -> None:
+        """Record a backend response.
+
+        Args:
+            accepted: Whether the backend accepted the request
+        """
+        now = time.monotonic()
+        self._expire(now)
+        self._count(now, accepted)
@@ -1,27 +1,7 @@
+import functools
 import pytest
 import asyncio
-from typing import Generator
-
-@pytest.fixture(scope="function")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    
-    # Clean up pending tasks
-    try:
-        pending = asyncio.all_tasks(loop)
-        if pending:
-            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        loop.run_until_complete(loop.shutdown_asyncgens())
-    except Exception:
-        pass
-    
-    try:
-        loop.close()
-    except Exception:
-        pass
+from pytest_asyncio import is_async_test
 
 @pytest.fixture
 async def aiohttp_client():
@@ -29,3 +9,35 @@ async def aiohttp_client():
     yield
     # Cleanup any remaining sessions
     await asyncio.sleep(0)  # Allow pending tasks to complete
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Cancel an async test's own task if it never finished.
+
+    Tests share the session event loop, so a test interrupted mid-await (for
+    example by pytest-timeout) would otherwise stay suspended into later
+    tests, along with any patches it has active. Only the task the test body
+    ran in is cancelled; tasks started by longer-lived fixtures, such as test
+    server connections, are left alone.
+    """
+    if not is_async_test(item):
+        return (yield)
+    test_func = item.obj
+    started = []
+
+    @functools.wraps(test_func)
+    async def tracked(*args, **kwargs):
+        started.append(asyncio.current_task())
+        return await test_func(*args, **kwargs)
+
+    item.obj = tracked
+    try:
+        return (yield)
+    finally:
+        item.obj = test_func
+        for task in started:
+            if not task.done():
+                task.cancel()
+                task.get_loop().run_until_complete(
+                    asyncio.gather(task, return_exceptions=True)
+                )
@@ -18,7 +18,7 @@ class MockAuthProvider(AuthProvider):
         self.auth_count = 0
         self.refresh_count = 0
     
-    async def authenticate(self) -> TokenInfo:
+    def _authenticate_sync(self) -> TokenInfo:
         """Mock authentication."""
         if self.should_fail:
             raise ValueError("Authentication failed")
@@ -32,7 +32,7 @@ class MockAuthProvider(AuthProvider):
             platform=self.platform
         )
     
-    async def refresh(self, token_info: TokenInfo) -> TokenInfo:
+    def _refresh_sync(self, token_info: TokenInfo) -> TokenInfo:
         """Mock token refresh."""
         if self.should_fail:
             raise ValueError("Refresh failed")
@@ -46,6 +46,14 @@ class MockAuthProvider(AuthProvider):
             platform=self.platform
         )
 
+    async def authenticate(self) -> TokenInfo:
+        """Mock authentication; no I/O, so it defers to the sync core."""
+        return self._authenticate_sync()
+
+    async def refresh(self, token_info: TokenInfo) -> TokenInfo:
+        """Mock token refresh; no I/O, so it defers to the sync core."""
+        return self._refresh_sync(token_info)
+
 @pytest.fixture
 def mock_provider():
     """Create a mock auth provider."""
@@ -32,6 +32,25 @@ def test_token_store_basic(temp_token_file):
     store.remove_token("test")
     assert store.get_token("test") is None
 
+def test_token_store_memory_backend():
+    """Test the in-memory backend never touches the filesystem."""
+    store = TokenStore(backend="memory")
+    assert store.storage_path is None
+
+    token = TokenInfo(access_token="test_token", platform="test")
+    store.store_token(token)
+    assert store.get_token("test") == token
+
+    store.remove_token("test")
+    assert store.get_token("test") is None
+
+def test_token_store_invalid_backend(temp_token_file):
+    """Test backend validation."""
+    with pytest.raises(ValueError):
+        TokenStore(temp_token_file, backend="redis")
+    with pytest.raises(ValueError):
+        TokenStore()
+
 def test_token_store_persistence(temp_token_file):
     """Test TokenStore persistence across instances."""
     # Store token in first instance
@@ -92,3 +92,8 @@ def sample_post():
         media_urls=["http://example.com/image.jpg"],
         metadata={"key": "value"}
     )
+
+@pytest.fixture(scope="module")
+def posts():
+    """Pre-built pool of simple posts shared across a test module."""
+    return tuple(SocialPost(content=f"Test {i}") for i in range(64))
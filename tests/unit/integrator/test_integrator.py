@@ -4,6 +4,11 @@ from unittest.mock import AsyncMock, MagicMock
 from social_integrator import SocialIntegrator, SocialPost
 from social_integrator.core.platform import PlatformError
 
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Keep the default token file out of the shared working directory."""
+    monkeypatch.chdir(tmp_path)
+
 @pytest.fixture
 def mock_twitter_provider():
     """Create a mock Twitter auth provider."""
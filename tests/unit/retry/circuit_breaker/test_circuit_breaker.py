@@ -1,51 +1,97 @@
 import pytest
 import time
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Optional, Tuple, Any
+from enum import IntEnum
+from unittest.mock import AsyncMock, patch
+from typing import Callable, Optional, Tuple, Any
+from tests.unit.retry.conftest import OK_BODY, OK_RESPONSE, resp
+
+class _State(IntEnum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+_STATE_NAMES = ("closed", "open", "half-open")
 
 class CircuitBreakerWithFallback:
     """Circuit breaker pattern implementation with fallback support."""
     
-    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0):
+    __slots__ = (
+        "failure_threshold", "recovery_time", "_recovery_ns", "failure_count",
+        "last_failure_time", "_state", "successful_probes", "required_probes",
+        "_attempt_handlers", "_success_handlers", "_time",
+    )
+    
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0,
+                 time_source: Callable[[], int] = time.monotonic_ns):
+        self._time = time_source  # monotonic clock in nanoseconds
         self.failure_threshold = failure_threshold
         self.recovery_time = recovery_time
+        self._recovery_ns = int(recovery_time * 1e9)
         self.failure_count = 0
         self.last_failure_time = None
-        self.state = "closed"  # closed, open, half-open
+        self._state = _State.CLOSED
         self.successful_probes = 0
         self.required_probes = 3
+        # Handlers indexed by _State
+        self._attempt_handlers = (
+            self._attempt_closed, self._attempt_open, self._attempt_half_open
+        )
+        self._success_handlers = (
+            self._success_closed, self._success_open, self._success_half_open
+        )
+
+    @property
+    def state(self) -> str:
+        """Circuit state name: closed, open or half-open."""
+        return _STATE_NAMES[self._state]
+
+    def record_failure(self) -> bool:
+        """Record a failure and possibly open the circuit.
 
-    def record_failure(self):
-        """Record a failure and possibly open the circuit."""
+        Returns:
+            True if the circuit is open after this failure
+        """
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = self._time()
         if self.failure_count >= self.failure_threshold:
-            self.state = "open"
+            self._state = _State.OPEN
             self.successful_probes = 0
+            return True
+        return False
+
+    def _success_closed(self):
+        self.failure_count = max(0, self.failure_count - 1)
+
+    def _success_open(self):
+        pass
+
+    def _success_half_open(self):
+        self.successful_probes += 1
+        if self.successful_probes >= self.required_probes:
+            self._state = _State.CLOSED
+            self.failure_count = 0
+            self.last_failure_time = None
 
     def record_success(self):
         """Record a success and possibly close the circuit."""
-        if self.state == "half-open":
-            self.successful_probes += 1
-            if self.successful_probes >= self.required_probes:
-                self.state = "closed"
-                self.failure_count = 0
-                self.last_failure_time = None
-        elif self.state == "closed":
-            self.failure_count = max(0, self.failure_count - 1)
+        self._success_handlers[self._state]()
+
+    def _attempt_closed(self) -> bool:
+        return True
+
+    def _attempt_open(self) -> bool:
+        if self._time() - self.last_failure_time >= self._recovery_ns:
+            self._state = _State.HALF_OPEN
+            return True
+        return False
+
+    def _attempt_half_open(self) -> bool:
+        return True
 
     def should_attempt_request(self) -> bool:
         """Check if request should be attempted based on circuit state."""
-        if self.state == "closed":
-            return True
-        elif self.state == "open":
-            if time.time() - self.last_failure_time >= self.recovery_time:
-                self.state = "half-open"
-                return True
-            return False
-        else:  # half-open
-            return True
+        return self._attempt_handlers[self._state]()
 
     async def execute_with_fallback(self, primary_func, fallback_func) -> Tuple[Any, str]:
         """Execute function with fallback if circuit is open."""
@@ -54,17 +100,21 @@ class CircuitBreakerWithFallback:
                 result = await primary_func()
                 self.record_success()
                 return result, "primary"
-            except Exception as e:
-                self.record_failure()
-                if not self.should_attempt_request():
+            except Exception:
+                if self.record_failure():
                     return await fallback_func(), "fallback"
                 raise
         return await fallback_func(), "fallback"
 
+@pytest.fixture
+def cb_factory():
+    """Build circuit breakers with per-test settings."""
+    return lambda **kwargs: CircuitBreakerWithFallback(**kwargs)
+
 @pytest.mark.asyncio
-async def test_circuit_breaker_basic_operation(twitter_api, social_post):
+async def test_circuit_breaker_basic_operation(cb_factory):
     """Test basic circuit breaker state transitions."""
-    circuit_breaker = CircuitBreakerWithFallback(failure_threshold=3, recovery_time=1.0)
+    circuit_breaker = cb_factory(failure_threshold=3, recovery_time=1.0)
     states = []
     
     # Mock responses that will fail initially
@@ -76,7 +126,7 @@ async def test_circuit_breaker_basic_operation(twitter_api, social_post):
         if request_count < 4:  # First 4 requests fail
             request_count += 1
             raise Exception("Service unavailable")
-        return {"data": {"id": "123"}}
+        return OK_BODY
     
     async def fallback_func():
         return {"data": {"id": "fallback"}}
@@ -99,15 +149,18 @@ async def test_circuit_breaker_basic_operation(twitter_api, social_post):
     assert states.count("closed") >= 1
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_recovery(twitter_api, social_post):
+async def test_circuit_breaker_recovery(cb_factory):
     """Test circuit breaker recovery after cooling period."""
-    circuit_breaker = CircuitBreakerWithFallback(failure_threshold=2, recovery_time=0.1)
+    clock = [0]
+    circuit_breaker = cb_factory(
+        failure_threshold=2, recovery_time=0.1, time_source=lambda: clock[0]
+    )
     
     # Mock responses that fail then succeed
     async def primary_func():
         if circuit_breaker.failure_count < 2:
             raise Exception("Service unavailable")
-        return {"data": {"id": "123"}}
+        return OK_BODY
     
     async def fallback_func():
         return {"data": {"id": "fallback"}}
@@ -121,8 +174,8 @@ async def test_circuit_breaker_recovery(twitter_api, social_post):
 
     assert circuit_breaker.state == "open"
     
-    # Wait for recovery time
-    await asyncio.sleep(0.2)
+    # Advance past the recovery time
+    clock[0] += 200_000_000
     
     # Should transition to half-open and then closed
     result, execution_type = await circuit_breaker.execute_with_fallback(
@@ -134,11 +187,13 @@ async def test_circuit_breaker_recovery(twitter_api, social_post):
     assert result["data"]["id"] == "123"
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_half_open_state(twitter_api, social_post):
+async def test_circuit_breaker_half_open_state(cb_factory):
     """Test circuit breaker behavior in half-open state."""
-    circuit_breaker = CircuitBreakerWithFallback(
+    clock = [0]
+    circuit_breaker = cb_factory(
         failure_threshold=2,
-        recovery_time=0.1
+        recovery_time=0.1,
+        time_source=lambda: clock[0]
     )
     
     success_count = 0
@@ -160,12 +215,12 @@ async def test_circuit_breaker_half_open_state(twitter_api, social_post):
         except Exception:
             pass
 
-    # Wait for recovery time
-    await asyncio.sleep(0.2)
+    # Advance past the recovery time
+    clock[0] += 200_000_000
     
     # Execute requests in half-open state
     results = []
-    for _ in range(circuit_breaker.required_probes + 1):
+    for _ in range(circuit_breaker.required_probes):
         result, execution_type = await circuit_breaker.execute_with_fallback(
             primary_func, fallback_func
         )
@@ -177,55 +232,58 @@ async def test_circuit_breaker_half_open_state(twitter_api, social_post):
     assert all(r[1] == "primary" for r in results)
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_with_real_requests(twitter_api, social_post):
+async def test_circuit_breaker_with_real_requests(twitter_api, social_post, cb_factory):
     """Test circuit breaker with simulated API requests."""
-    circuit_breaker = CircuitBreakerWithFallback(
+    clock = [0]
+    circuit_breaker = cb_factory(
         failure_threshold=3,
-        recovery_time=0.1
+        recovery_time=0.1,
+        time_source=lambda: clock[0]
     )
     
     # Mock session with varying responses
     mock_session = AsyncMock()
     request_count = 0
     
-    async def mock_response():
+    async def mock_response(*args, **kwargs):
         nonlocal request_count
         request_count += 1
         
         if request_count <= 3:  # First 3 requests fail
-            return MagicMock(
-                status=503,
-                ok=False
-            )
-        return MagicMock(
-            status=200,
-            ok=True,
-            json=AsyncMock(return_value={"data": {"id": "123"}})
-        )
+            return resp(503)
+        return OK_RESPONSE
     
-    mock_session.post.side_effect = lambda *args, **kwargs: AsyncMock(
-        __aenter__=AsyncMock(return_value=mock_response())
-    )()
+    mock_session.post.side_effect = mock_response
+
+    async def fallback_func():
+        return {"data": {"id": "fallback"}}
+
+    states = []
+
+    async def one():
+        states.append(circuit_breaker.state)
+        return await circuit_breaker.execute_with_fallback(
+            lambda: twitter_api.post(social_post), fallback_func
+        )
 
     with patch.object(twitter_api, "session", mock_session):
-        # Execute requests and track circuit state
-        states = []
-        results = []
-        
-        for _ in range(5):
-            states.append(circuit_breaker.state)
-            try:
-                result, execution_type = await circuit_breaker.execute_with_fallback(
-                    lambda: twitter_api.post(social_post),
-                    lambda: {"data": {"id": "fallback"}}
-                )
-                results.append((result, execution_type))
-            except Exception:
-                results.append((None, "error"))
-            await asyncio.sleep(0.05)
+        # Fire the requests concurrently; failures come back as exceptions
+        results = await asyncio.gather(
+            *(one() for _ in range(5)), return_exceptions=True
+        )
+        execution_types = [
+            "error" if isinstance(r, Exception) else r[1] for r in results
+        ]
 
-        # Verify circuit breaker behavior
+        # Verify circuit breaker tripped under the failure burst
         assert "closed" in states
-        assert "open" in states
-        assert any(r[1] == "fallback" for r in results)
-        assert any(r[1] == "primary" for r in results)
+        assert "fallback" in execution_types
+        assert circuit_breaker.state == "open"
+
+        # After the recovery window the next request probes the primary
+        clock[0] += 200_000_000
+        result, execution_type = await circuit_breaker.execute_with_fallback(
+            lambda: twitter_api.post(social_post), fallback_func
+        )
+        assert execution_type == "primary"
+        assert result["data"]["id"] == "123"
@@ -1,12 +1,70 @@
+import aiohttp
+import asyncio
+import json
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+import types
+from dataclasses import dataclass, field
+from typing import Any, Mapping
 from social_integrator.platforms.twitter import TwitterAPI
 from social_integrator.core.platform import SocialPost
 
+# Shared read-only success payload for mocked responses
+OK_BODY = types.MappingProxyType({"data": types.MappingProxyType({"id": "123"})})
+
+@dataclass(frozen=True, slots=True)
+class FakeResponse:
+    """Immutable stand-in for an aiohttp response."""
+    status: int
+    payload: Mapping[str, Any] = field(default_factory=dict)
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    async def json(self, **kwargs: Any) -> Mapping[str, Any]:
+        return self.payload
+
+    async def read(self) -> bytes:
+        return json.dumps(self.payload, default=dict).encode()
+
+    def release(self) -> None:
+        pass
+
+def resp(status, body=None, **kwargs):
+    """Build a response stub with ``body`` as its JSON payload."""
+    return FakeResponse(status, {} if body is None else body, **kwargs)
+
+# Shared success response; safe to hand out repeatedly since it is immutable
+OK_RESPONSE = resp(200, body=OK_BODY)
+
+# Connection cap for the shared connector, matching the pool managers' max_size
+CONNECTOR_LIMIT = 10
+
+@pytest.fixture(scope="module")
+async def aiohttp_connector():
+    """Create one bounded TCP connector shared by a test module."""
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTOR_LIMIT,
+        limit_per_host=CONNECTOR_LIMIT,
+        keepalive_timeout=30,
+        ttl_dns_cache=300
+    )
+    yield connector
+    await connector.close()
+
 @pytest.fixture
-def twitter_api():
-    """Create a TwitterAPI instance."""
-    return TwitterAPI(auth_token="test_token")
+async def twitter_api(aiohttp_connector):
+    """Create a fresh TwitterAPI pooling through the module's connector."""
+    api = TwitterAPI(auth_token="test_token", connector=aiohttp_connector)
+    yield api
+    # Fetches left in flight would otherwise run on into later tests on the
+    # shared session loop
+    for task in api._metrics_inflight.values():
+        task.cancel()
+    await asyncio.gather(*api._metrics_inflight.values(), return_exceptions=True)
+    api._metrics_cache.clear()
+    await api.close()
 
 @pytest.fixture
 def social_post():
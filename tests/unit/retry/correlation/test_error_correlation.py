@@ -1,53 +1,91 @@
 import pytest
+import sys
 import time
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Optional, Dict, Any
+import itertools
+from collections import Counter, deque
+from unittest.mock import AsyncMock, patch
+from typing import Optional, Dict, Any, Iterable, Tuple
+from tests.unit.retry.conftest import OK_RESPONSE
 
 class ErrorCorrelationAnalyzer:
     """Analyzes error patterns to detect correlated failures."""
     
+    __slots__ = (
+        "window_size", "error_window", "error_patterns", "correlation_scores",
+        "_prev_error", "_pattern_total", "_pattern_repeated", "_window_counts",
+    )
+    
     def __init__(self, window_size: int = 10):
         self.window_size = window_size
-        self.error_window = []
-        self.error_patterns = {}
+        self.error_window = deque(maxlen=window_size)
+        self.error_patterns = Counter()
+        self._window_counts = Counter()
         self.correlation_scores = []
+        self._prev_error: Optional[str] = None
+        self._pattern_total = 0
+        self._pattern_repeated = 0
 
     def add_error(self, error_type: str, timestamp: float):
         """Add error to window and analyze patterns."""
+        error_type = sys.intern(error_type)
+        if len(self.error_window) == self.window_size:
+            evicted = self.error_window[0][0]
+            self._window_counts[evicted] -= 1
+            if not self._window_counts[evicted]:
+                del self._window_counts[evicted]
         self.error_window.append((error_type, timestamp))
-        if len(self.error_window) > self.window_size:
-            self.error_window.pop(0)
+        self._window_counts[error_type] += 1
 
         # Analyze error patterns
-        if len(self.error_window) >= 2:
-            pattern = tuple(e[0] for e in self.error_window[-2:])
-            self.error_patterns[pattern] = self.error_patterns.get(pattern, 0) + 1
+        if self._prev_error is not None:
+            self.error_patterns[(self._prev_error, error_type)] += 1
+            self._pattern_total += 1
+            self._pattern_repeated += self._prev_error == error_type
+        self._prev_error = error_type
+
+    def add_errors(self, items: Iterable[Tuple[str, float]]):
+        """Add a batch of (error_type, timestamp) pairs in order."""
+        batch = [(sys.intern(error_type), timestamp) for error_type, timestamp in items]
+        if not batch:
+            return
+        error_types = [error_type for error_type, _ in batch]
+        if self._prev_error is not None:
+            error_types.insert(0, self._prev_error)
+        pairs = list(zip(error_types, error_types[1:]))
+
+        self.error_patterns.update(pairs)
+        self._pattern_total += len(pairs)
+        self._pattern_repeated += sum(a == b for a, b in pairs)
+        self.error_window.extend(batch)
+        self._window_counts = Counter(error_type for error_type, _ in self.error_window)
+        self._prev_error = error_types[-1]
 
     def get_correlation_score(self) -> float:
         """Calculate error correlation score."""
-        if not self.error_patterns:
+        if not self._pattern_total:
             return 0.0
 
-        total_patterns = sum(self.error_patterns.values())
-        repeated_patterns = sum(
-            count for pattern, count in self.error_patterns.items()
-            if pattern[0] == pattern[1]
-        )
-        score = repeated_patterns / total_patterns
+        score = self._pattern_repeated / self._pattern_total
         self.correlation_scores.append(score)
         return score
 
     def get_dominant_error(self) -> Optional[str]:
         """Get most frequent error type in current window."""
-        if not self.error_window:
+        if not self._window_counts:
             return None
 
-        error_counts = {}
-        for error_type, _ in self.error_window:
-            error_counts[error_type] = error_counts.get(error_type, 0) + 1
+        return self._window_counts.most_common(1)[0][0]
 
-        return max(error_counts.items(), key=lambda x: x[1])[0]
+# Alternating error pattern
+ALTERNATING_ERRORS = ("timeout", "network") * 3
+
+# Error sequences of decreasing correlation, flattened
+EVOLVING_ERRORS = (
+    ("timeout",) * 3                         # High correlation
+    + ("network", "timeout") * 2             # Pattern correlation
+    + ("rate_limit", "network", "timeout")   # Low correlation
+)
 
 @pytest.mark.asyncio
 async def test_error_correlation_basic():
@@ -62,8 +100,7 @@ async def test_error_correlation_basic():
         "rate_limit"          # Single rate limit
     ]
     
-    for i, error in enumerate(errors):
-        analyzer.add_error(error, current_time + i)
+    analyzer.add_errors((error, current_time + i) for i, error in enumerate(errors))
         
     # Check correlation score
     score = analyzer.get_correlation_score()
@@ -80,10 +117,7 @@ async def test_error_pattern_detection():
     current_time = time.time()
     
     # Add alternating error pattern
-    pattern = ["timeout", "network"] * 3
-    
-    for i, error in enumerate(pattern):
-        analyzer.add_error(error, current_time + i)
+    analyzer.add_errors(zip(ALTERNATING_ERRORS, itertools.count(current_time)))
         
     # Verify pattern detection
     assert ("timeout", "network") in analyzer.error_patterns
@@ -121,17 +155,9 @@ async def test_correlation_score_evolution():
     current_time = time.time()
     scores = []
     
-    # Test different error sequences
-    sequences = [
-        ["timeout"] * 3,                    # High correlation
-        ["network", "timeout"] * 2,         # Pattern correlation
-        ["rate_limit", "network", "timeout"] # Low correlation
-    ]
-    
-    for sequence in sequences:
-        for i, error in enumerate(sequence):
-            analyzer.add_error(error, current_time + len(scores) + i)
-            scores.append(analyzer.get_correlation_score())
+    for event in zip(EVOLVING_ERRORS, itertools.count(current_time)):
+        analyzer.add_error(*event)
+        scores.append(analyzer.get_correlation_score())
     
     # Verify score evolution
     assert scores[2] > 0.8  # High correlation for repeated errors
@@ -146,7 +172,7 @@ async def test_error_correlation_with_requests(twitter_api, social_post):
     mock_session = AsyncMock()
     request_count = 0
     
-    async def mock_response():
+    async def mock_response(*args, **kwargs):
         nonlocal request_count
         current_time = time.time()
         
@@ -160,15 +186,9 @@ async def test_error_correlation_with_requests(twitter_api, social_post):
             raise aiohttp.ClientError("Network error")
         else:  # Then success
             request_count += 1
-            return MagicMock(
-                status=200,
-                ok=True,
-                json=AsyncMock(return_value={"data": {"id": "123"}})
-            )
+            return OK_RESPONSE
     
-    mock_session.post.side_effect = lambda *args, **kwargs: AsyncMock(
-        __aenter__=AsyncMock(return_value=mock_response())
-    )()
+    mock_session.post.side_effect = mock_response
 
     with patch.object(twitter_api, "session", mock_session):
         # Make requests and track correlation
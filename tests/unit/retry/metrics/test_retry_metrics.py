@@ -1,60 +1,108 @@
 import pytest
+import sys
 import time
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import types
+from collections import Counter, defaultdict, deque
+from unittest.mock import AsyncMock, patch
 from typing import Dict, Any, Optional
+from tests.unit.retry.conftest import OK_RESPONSE, resp
+
+class RequestStats:
+    """Running totals for one request id."""
+
+    __slots__ = ("sum", "n", "retries")
+
+    def __init__(self):
+        self.sum = 0.0
+        self.n = 0
+        self.retries = 0
 
 class RetryMetricsCollector:
     """Collects and analyzes retry-related metrics."""
     
-    def __init__(self):
-        self.retry_counts = {}
-        self.response_times = {}
-        self.error_types = {}
+    __slots__ = (
+        "_stats", "error_types", "success_rate",
+        "total_requests", "failed_requests", "retry_intervals",
+        "consecutive_failures", "last_success_time", "_retry_sum",
+        "_per_req_avg_sum", "_interval_sum", "_dirty", "_metrics_view",
+    )
+    
+    def __init__(self, interval_capacity: int = 4096):
+        self._stats = defaultdict(RequestStats)
+        self.error_types = Counter()
         self.success_rate = 1.0
         self.total_requests = 0
         self.failed_requests = 0
-        self.retry_intervals = []
+        self.retry_intervals = deque(maxlen=interval_capacity)
         self.consecutive_failures = 0
         self.last_success_time = None
+        self._retry_sum = 0
+        self._per_req_avg_sum = 0.0
+        self._interval_sum = 0.0
+        self._dirty = True
+        self._metrics_view = {
+            "success_rate": 1.0,
+            "avg_retries": 0,
+            "avg_response_time": 0,
+            "error_distribution": types.MappingProxyType(self.error_types),
+            "avg_retry_interval": 0,
+            "consecutive_failures": 0,
+            "time_since_last_success": None,
+        }
 
     def record_attempt(self, request_id: str, response_time: float, 
                       error_type: Optional[str] = None, retry_count: int = 0):
         """Record metrics for an attempt."""
-        self.retry_counts[request_id] = retry_count
-        self.response_times.setdefault(request_id, []).append(response_time)
+        if error_type:
+            error_type = sys.intern(error_type)
+        self._dirty = True
+        stats = self._stats[request_id]
+        self._retry_sum += retry_count - stats.retries
+        stats.retries = retry_count
+        prev_avg = stats.sum / stats.n if stats.n else 0.0
+        stats.sum += response_time
+        stats.n += 1
+        self._per_req_avg_sum += stats.sum / stats.n - prev_avg
         
         if error_type:
-            self.error_types[error_type] = self.error_types.get(error_type, 0) + 1
+            self.error_types[error_type] += 1
             self.failed_requests += 1
             self.consecutive_failures += 1
         else:
             self.consecutive_failures = 0
-            self.last_success_time = time.time()
+            self.last_success_time = time.monotonic_ns()
             
         self.total_requests += 1
         self.success_rate = 1 - (self.failed_requests / self.total_requests)
 
     def record_retry_interval(self, interval: float):
         """Record time between retries."""
+        self._dirty = True
+        if len(self.retry_intervals) == self.retry_intervals.maxlen:
+            self._interval_sum -= self.retry_intervals[0]
         self.retry_intervals.append(interval)
+        self._interval_sum += interval
 
     def get_metrics(self) -> Dict[str, Any]:
-        """Get current metrics."""
-        return {
-            "success_rate": self.success_rate,
-            "avg_retries": (sum(self.retry_counts.values()) / 
-                          len(self.retry_counts) if self.retry_counts else 0),
-            "avg_response_time": (sum(sum(times) / len(times) 
-                                for times in self.response_times.values()) / 
-                                len(self.response_times) if self.response_times else 0),
-            "error_distribution": self.error_types,
-            "avg_retry_interval": (sum(self.retry_intervals) / 
-                                 len(self.retry_intervals) if self.retry_intervals else 0),
-            "consecutive_failures": self.consecutive_failures,
-            "time_since_last_success": (time.time() - self.last_success_time 
-                                      if self.last_success_time else None)
-        }
+        """Get current metrics (one dict updated in place; read-only)."""
+        v = self._metrics_view
+        if self._dirty:
+            v["success_rate"] = self.success_rate
+            v["avg_retries"] = (self._retry_sum / 
+                                len(self._stats) if self._stats else 0)
+            v["avg_response_time"] = (self._per_req_avg_sum / 
+                                      len(self._stats) if self._stats else 0)
+            v["avg_retry_interval"] = (self._interval_sum / 
+                                       len(self.retry_intervals) if self.retry_intervals else 0)
+            v["consecutive_failures"] = self.consecutive_failures
+            self._dirty = False
+        # Depends on the clock, so refreshed on every call
+        v["time_since_last_success"] = (
+            (time.monotonic_ns() - self.last_success_time) / 1e9
+            if self.last_success_time is not None else None
+        )
+        return v
 
 @pytest.mark.asyncio
 async def test_basic_metrics_collection():
@@ -137,7 +185,7 @@ async def test_metrics_with_real_requests(twitter_api, social_post):
     mock_session = AsyncMock()
     request_count = 0
     
-    async def mock_response():
+    async def mock_response(*args, **kwargs):
         nonlocal request_count
         request_count += 1
         
@@ -151,22 +199,18 @@ async def test_metrics_with_real_requests(twitter_api, social_post):
             raise aiohttp.ClientError("Network error")
         else:  # Then succeed
             collector.record_attempt(f"req{request_count}", 0.1)
-            return MagicMock(
-                status=200,
-                ok=True,
-                json=AsyncMock(return_value={"data": {"id": "123"}})
-            )
-    
-    mock_session.post.side_effect = lambda *args, **kwargs: AsyncMock(
-        __aenter__=AsyncMock(return_value=mock_response())
-    )()
+            return OK_RESPONSE
+    
+    mock_session.post.side_effect = mock_response
 
     with patch.object(twitter_api, "session", mock_session):
-        # Make requests and collect metrics
-        for _ in range(4):
-            try:
-                await twitter_api.post(social_post)
-            except Exception:
+        # Make requests concurrently and collect metrics
+        results = await asyncio.gather(
+            *(twitter_api.post(social_post) for _ in range(4)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
                 collector.record_retry_interval(0.5)
                 
         metrics = collector.get_metrics()
@@ -197,5 +241,5 @@ async def test_response_time_analysis():
     metrics = collector.get_metrics()
     
     assert 0.1 < metrics["avg_response_time"] < 0.5
-    assert all(0.1 <= sum(times)/len(times) <= 0.5 
-              for times in collector.response_times.values())
+    assert all(0.1 <= stats.sum/stats.n <= 0.5 
+              for stats in collector._stats.values())
@@ -1,60 +1,140 @@
 import pytest
 import asyncio
 import time
-from typing import Dict, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+class Lease:
+    """A held pool connection; clear ``success`` to record a failure."""
+
+    __slots__ = ("success",)
+
+    def __init__(self):
+        self.success = True
 
 class ConnectionPoolManager:
     """Manages a pool of connections with adaptive sizing."""
-    
+
+    __slots__ = (
+        "pool_size", "max_size", "active_connections", "_slot_free",
+        "_succ", "_fail", "_ewma"
+    )
+
+    # Weight of the newest sample in the response time moving average
+    EWMA_ALPHA = 0.2
+
     def __init__(self, pool_size: int = 5, max_size: int = 10):
         self.pool_size = pool_size
         self.max_size = max_size
         self.active_connections = 0
-        self.connection_semaphore = asyncio.Semaphore(pool_size)
-        self.pool_metrics = {
-            "timeouts": 0,
-            "successes": 0,
-            "total_time": 0.0
+        # Set whenever a connection may have become available; resizing only
+        # changes pool_size, so no primitive ever has to be rebuilt
+        self._slot_free = asyncio.Event()
+        self._slot_free.set()
+        self._succ = 0
+        self._fail = 0
+        self._ewma = 0.0
+
+    @property
+    def pool_metrics(self) -> Dict[str, float]:
+        """Snapshot of the success/timeout counters and average response time."""
+        return {
+            "timeouts": self._fail,
+            "successes": self._succ,
+            "avg_time": self._ewma
         }
 
     def adjust_pool_size(self, success: bool, response_time: float):
         """Adjust pool size based on performance metrics."""
+        if self._succ + self._fail == 0:
+            self._ewma = response_time
+        else:
+            self._ewma += self.EWMA_ALPHA * (response_time - self._ewma)
         if success:
-            self.pool_metrics["successes"] += 1
+            self._succ += 1
         else:
-            self.pool_metrics["timeouts"] += 1
-
-        self.pool_metrics["total_time"] += response_time
-        avg_time = self.pool_metrics["total_time"] / (
-            self.pool_metrics["successes"] + self.pool_metrics["timeouts"]
-        )
+            self._fail += 1
 
         # Adjust pool size based on metrics
-        if self.pool_metrics["timeouts"] > self.pool_metrics["successes"] / 2:
+        if self._fail > self._succ / 2:
             # Too many timeouts, reduce pool size
             self.pool_size = max(1, self.pool_size - 1)
-        elif avg_time < 0.2 and self.active_connections >= self.pool_size:
+        elif self._ewma < 0.2 and self.active_connections >= self.pool_size:
             # Fast responses and high utilization, increase pool size
             self.pool_size = min(self.max_size, self.pool_size + 1)
+            self._slot_free.set()
 
-        # Update semaphore if size changed
-        if self.connection_semaphore._value != self.pool_size:
-            self.connection_semaphore = asyncio.Semaphore(self.pool_size)
+    def available(self) -> int:
+        """Number of connections that can be acquired without waiting."""
+        return max(0, self.pool_size - self.active_connections)
 
     async def acquire(self):
         """Acquire a connection from the pool."""
-        await self.connection_semaphore.acquire()
+        while self.active_connections >= self.pool_size:
+            self._slot_free.clear()
+            await self._slot_free.wait()
         self.active_connections += 1
 
     def release(self):
-        """Release a connection back to the pool."""
+        """Release a connection back to the pool.
+
+        Raises:
+            ValueError: If no connection is currently held
+        """
+        if self.active_connections <= 0:
+            raise ValueError("release() called more times than acquire()")
         self.active_connections -= 1
-        self.connection_semaphore.release()
+        self._slot_free.set()
+
+    @asynccontextmanager
+    async def lease(self, record: bool = True) -> AsyncIterator[Lease]:
+        """Hold a connection for the duration of the block.
+
+        Args:
+            record: Feed the block's outcome and duration to adjust_pool_size;
+                an exception escaping the block counts as a failure
+        """
+        await self.acquire()
+        lease = Lease()
+        start = time.perf_counter_ns()
+        try:
+            yield lease
+        except BaseException:
+            lease.success = False
+            raise
+        finally:
+            if record:
+                self.adjust_pool_size(
+                    lease.success, (time.perf_counter_ns() - start) / 1e9
+                )
+            self.release()
+
+@pytest.fixture(scope="module")
+def _free_pools():
+    """Pool managers handed back by finished tests, ready for reuse."""
+    return []
+
+@pytest.fixture
+def pool_factory(_free_pools):
+    """Build pool managers, reinitializing instances from earlier tests."""
+    handed_out = []
+
+    def make(**kwargs) -> ConnectionPoolManager:
+        if _free_pools:
+            pool = _free_pools.pop()
+            pool.__init__(**kwargs)
+        else:
+            pool = ConnectionPoolManager(**kwargs)
+        handed_out.append(pool)
+        return pool
+
+    yield make
+    _free_pools.extend(handed_out)
 
 @pytest.mark.asyncio
-async def test_pool_basic_operation():
+async def test_pool_basic_operation(pool_factory):
     """Test basic pool operations with concurrent requests."""
-    pool = ConnectionPoolManager(pool_size=3, max_size=5)
+    pool = pool_factory(pool_size=3, max_size=5)
     
     # Track concurrent connections
     max_concurrent = 0
@@ -62,42 +142,37 @@ async def test_pool_basic_operation():
     
     async def make_request():
         nonlocal current_concurrent, max_concurrent
-        await pool.acquire()
-        try:
+        async with pool.lease(record=False):
             current_concurrent += 1
             max_concurrent = max(max_concurrent, current_concurrent)
-            await asyncio.sleep(0.01)  # Reduced from 0.1
-            return {"success": True}
-        finally:
+            await asyncio.sleep(0)  # Yield so other requests can contend
             current_concurrent -= 1
-            pool.release()
+        return {"success": True}
 
     # Make concurrent requests
-    tasks = [make_request() for _ in range(5)]
-    results = await asyncio.gather(*tasks)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(make_request()) for _ in range(5)]
+    results = [task.result() for task in tasks]
     
     # Verify pool constraints were respected
     assert max_concurrent <= pool.pool_size
     assert all(isinstance(r, dict) for r in results)
 
 @pytest.mark.asyncio
-async def test_pool_size_adaptation():
+async def test_pool_size_adaptation(pool_factory):
     """Test pool size adaptation based on performance metrics."""
-    pool = ConnectionPoolManager(pool_size=2, max_size=4)
+    pool = pool_factory(pool_size=2, max_size=4)
     pool_sizes = []
     
     async def simulate_request(delay: float, success: bool):
-        await pool.acquire()
         try:
-            start_time = time.time()
-            await asyncio.sleep(delay)
-            pool.adjust_pool_size(success, time.time() - start_time)
-            pool_sizes.append(pool.pool_size)
-            if not success:
-                raise asyncio.TimeoutError()
+            async with pool.lease():
+                await asyncio.sleep(delay)
+                if not success:
+                    raise asyncio.TimeoutError()
             return {"success": True}
         finally:
-            pool.release()
+            pool_sizes.append(pool.pool_size)
 
     # Test scenarios with shorter delays
     scenarios = [
@@ -120,26 +195,22 @@ async def test_pool_size_adaptation():
     assert max(pool_sizes) <= pool.max_size
 
 @pytest.mark.asyncio
-async def test_pool_concurrent_load():
+async def test_pool_concurrent_load(pool_factory):
     """Test pool behavior under concurrent load."""
-    pool = ConnectionPoolManager(pool_size=2, max_size=5)
+    pool = pool_factory(pool_size=2, max_size=5)
     results = []
     
     async def worker(worker_id: int):
         for _ in range(3):  # Each worker makes 3 requests
-            await pool.acquire()
-            try:
-                start_time = time.time()
-                await asyncio.sleep(0.01)  # Reduced from 0.1
-                success = worker_id % 2 == 0  # Alternate success/failure
-                pool.adjust_pool_size(success, time.time() - start_time)
-                results.append((worker_id, success))
-            finally:
-                pool.release()
+            async with pool.lease() as lease:
+                await asyncio.sleep(0)  # Yield so other workers can contend
+                lease.success = worker_id % 2 == 0  # Alternate success/failure
+            results.append((worker_id, lease.success))
 
     # Start multiple workers
-    workers = [worker(i) for i in range(4)]
-    await asyncio.gather(*workers)
+    async with asyncio.TaskGroup() as tg:
+        for i in range(4):
+            tg.create_task(worker(i))
     
     # Verify results
     assert len(results) == 12  # 4 workers * 3 requests
@@ -147,17 +218,14 @@ async def test_pool_concurrent_load():
     assert pool.pool_size <= pool.max_size
 
 @pytest.mark.asyncio
-async def test_pool_error_handling():
+async def test_pool_error_handling(pool_factory):
     """Test pool behavior with error conditions."""
-    pool = ConnectionPoolManager(pool_size=2, max_size=4)
+    pool = pool_factory(pool_size=2, max_size=4)
     initial_active = pool.active_connections
     
     async def failing_request():
-        await pool.acquire()
-        try:
+        async with pool.lease(record=False):
             raise Exception("Simulated error")
-        finally:
-            pool.release()
 
     # Test error scenarios
     for _ in range(3):
@@ -166,35 +234,42 @@ async def test_pool_error_handling():
     
     # Verify no connection leaks
     assert pool.active_connections == initial_active
-    assert pool.connection_semaphore._value == pool.pool_size
+    assert pool.available() == pool.pool_size
 
 @pytest.mark.asyncio
-async def test_pool_timeout_handling():
+async def test_pool_over_release(pool_factory):
+    """Test releasing more connections than were acquired is rejected."""
+    pool = pool_factory(pool_size=2, max_size=4)
+
+    await pool.acquire()
+    pool.release()
+    with pytest.raises(ValueError):
+        pool.release()
+    assert pool.active_connections == 0
+
+@pytest.mark.asyncio
+async def test_pool_timeout_handling(pool_factory):
     """Test pool behavior with timeout scenarios."""
-    pool = ConnectionPoolManager(pool_size=2, max_size=4)
+    pool = pool_factory(pool_size=2, max_size=4)
     
     async def timeout_request(delay: float):
-        await pool.acquire()
-        try:
-            start_time = time.time()
+        async with pool.lease() as lease:
             try:
                 async with asyncio.timeout(0.02):  # Reduced from 0.2
                     await asyncio.sleep(delay)
-                success = True
             except asyncio.TimeoutError:
-                success = False
-            pool.adjust_pool_size(success, time.time() - start_time)
-            return success
-        finally:
-            pool.release()
+                lease.success = False
+        return lease.success
 
     # Test mixed timeout scenarios
-    results = await asyncio.gather(
-        timeout_request(0.01),  # Should succeed
-        timeout_request(0.03),  # Should timeout
-        timeout_request(0.01),  # Should succeed
-        return_exceptions=True
-    )
+    # timeout_request handles its own TimeoutError, so no sibling is cancelled
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(timeout_request(0.01)),  # Should succeed
+            tg.create_task(timeout_request(0.03)),  # Should timeout
+            tg.create_task(timeout_request(0.01)),  # Should succeed
+        ]
+    results = [task.result() for task in tasks]
     
     # Verify results
     successes = [r for r in results if r is True]
@@ -1,11 +1,24 @@
 import pytest
 import asyncio
+import heapq
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections import deque
+from unittest.mock import AsyncMock, patch
 from typing import Dict, Optional
+from tests.unit.retry.conftest import CONNECTOR_LIMIT, resp
+
+# Immutable responses reused across mocked requests
+FAST_RESPONSE = resp(200, body={"data": {"id": "fast"}})
+SLOW_RESPONSE = resp(200)
+MEDIUM_RESPONSE = resp(200, body={"data": {"id": "medium"}})
 
 class AdaptiveTimeoutManager:
     """Manages timeouts with adaptive strategies."""
+
+    # Number of recent response times kept for percentile queries
+    RESPONSE_WINDOW = 100
+    # Number of most recent response times the timeout is averaged over
+    AVG_SAMPLES = 3
     
     def __init__(self, initial_timeout: float = 1.0, 
                  min_timeout: float = 0.5, 
@@ -15,8 +28,21 @@ class AdaptiveTimeoutManager:
         self.max_timeout = max_timeout
         self.success_streak = 0
         self.failure_streak = 0
-        self.timeout_history = []
-        self.response_times = []
+        self.timeout_history = deque(maxlen=1024)
+        self.response_times = deque(maxlen=self.RESPONSE_WINDOW)
+        # Running sum of the last AVG_SAMPLES response times
+        self._recent_sum = 0.0
+
+    def p99(self) -> float:
+        """Get the 99th percentile of recent response times.
+
+        Returns:
+            P99 response time, or the current timeout if nothing was recorded
+        """
+        if not self.response_times:
+            return self.current_timeout
+        k = max(1, len(self.response_times) // 100)
+        return heapq.nlargest(k, self.response_times)[-1]
 
     def record_result(self, success: bool, response_time: Optional[float] = None):
         """Record request result and adjust timeout."""
@@ -24,10 +50,16 @@ class AdaptiveTimeoutManager:
             self.success_streak += 1
             self.failure_streak = 0
             if response_time:
-                self.response_times.append(response_time)
+                times = self.response_times
+                times.append(response_time)
+                self._recent_sum += response_time
+                # The window is longer than the averaged tail, so the sample
+                # leaving the tail is still in the deque
+                if len(times) > self.AVG_SAMPLES:
+                    self._recent_sum -= times[-self.AVG_SAMPLES - 1]
                 # Adjust timeout based on response time patterns
-                if len(self.response_times) >= 3:
-                    avg_time = sum(self.response_times[-3:]) / 3
+                if len(times) >= self.AVG_SAMPLES:
+                    avg_time = self._recent_sum / self.AVG_SAMPLES
                     self.current_timeout = min(
                         self.max_timeout,
                         max(self.min_timeout, avg_time * 2)
@@ -46,21 +78,43 @@ class AdaptiveTimeoutManager:
 
     async def execute_with_timeout(self, func, *args, **kwargs):
         """Execute function with current timeout."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             async with asyncio.timeout(self.current_timeout):
                 result = await func(*args, **kwargs)
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             self.record_result(True, response_time)
             return result
         except asyncio.TimeoutError:
             self.record_result(False)
             raise
 
+@pytest.fixture(scope="module")
+def _free_timeout_managers():
+    """Timeout managers handed back by finished tests, ready for reuse."""
+    return []
+
+@pytest.fixture
+def timeout_manager_factory(_free_timeout_managers):
+    """Build timeout managers, reinitializing instances from earlier tests."""
+    handed_out = []
+
+    def make(**kwargs) -> AdaptiveTimeoutManager:
+        if _free_timeout_managers:
+            manager = _free_timeout_managers.pop()
+            manager.__init__(**kwargs)
+        else:
+            manager = AdaptiveTimeoutManager(**kwargs)
+        handed_out.append(manager)
+        return manager
+
+    yield make
+    _free_timeout_managers.extend(handed_out)
+
 @pytest.mark.asyncio
-async def test_basic_timeout_handling():
+async def test_basic_timeout_handling(timeout_manager_factory):
     """Test basic timeout handling functionality."""
-    timeout_manager = AdaptiveTimeoutManager(initial_timeout=1.0)
+    timeout_manager = timeout_manager_factory(initial_timeout=1.0)
     
     async def mock_request(delay: float):
         await asyncio.sleep(delay)
@@ -77,9 +131,9 @@ async def test_basic_timeout_handling():
     assert timeout_manager.failure_streak == 1
 
 @pytest.mark.asyncio
-async def test_timeout_adaptation():
+async def test_timeout_adaptation(timeout_manager_factory):
     """Test timeout adaptation based on response patterns."""
-    timeout_manager = AdaptiveTimeoutManager(
+    timeout_manager = timeout_manager_factory(
         initial_timeout=1.0,
         min_timeout=0.5,
         max_timeout=3.0
@@ -111,39 +165,29 @@ async def test_timeout_adaptation():
     assert max(timeout_manager.timeout_history) <= timeout_manager.max_timeout
 
 @pytest.mark.asyncio
-async def test_timeout_with_real_requests(twitter_api, social_post):
+async def test_timeout_with_real_requests(twitter_api, social_post, timeout_manager_factory):
     """Test timeout handling with simulated API requests."""
-    timeout_manager = AdaptiveTimeoutManager(initial_timeout=1.0)
+    timeout_manager = timeout_manager_factory(initial_timeout=1.0)
     
     # Mock session with varying response times
     mock_session = AsyncMock()
     request_count = 0
     
-    async def mock_response():
+    async def mock_response(*args, **kwargs):
         nonlocal request_count
         request_count += 1
         
         if request_count <= 2:  # First 2 requests are fast
             await asyncio.sleep(0.3)
-            return MagicMock(
-                status=200,
-                ok=True,
-                json=AsyncMock(return_value={"data": {"id": "fast"}})
-            )
+            return FAST_RESPONSE
         elif request_count <= 4:  # Next 2 are slow
             await asyncio.sleep(1.5)  # Should timeout
-            return MagicMock()
+            return SLOW_RESPONSE
         else:  # Rest are medium
             await asyncio.sleep(0.7)
-            return MagicMock(
-                status=200,
-                ok=True,
-                json=AsyncMock(return_value={"data": {"id": "medium"}})
-            )
+            return MEDIUM_RESPONSE
     
-    mock_session.post.side_effect = lambda *args, **kwargs: AsyncMock(
-        __aenter__=AsyncMock(return_value=mock_response())
-    )()
+    mock_session.post.side_effect = mock_response
 
     with patch.object(twitter_api, "session", mock_session):
         results = []
@@ -163,10 +207,13 @@ async def test_timeout_with_real_requests(twitter_api, social_post):
         assert len(timeouts) == 2  # 2 timeouts
         assert timeout_manager.current_timeout > 1.0  # Should have increased
 
+    # The real session pools connections through the shared bounded connector
+    assert twitter_api.session.connector.limit == CONNECTOR_LIMIT
+
 @pytest.mark.asyncio
-async def test_timeout_recovery():
+async def test_timeout_recovery(timeout_manager_factory):
     """Test timeout recovery after failures."""
-    timeout_manager = AdaptiveTimeoutManager(
+    timeout_manager = timeout_manager_factory(
         initial_timeout=1.0,
         min_timeout=0.5,
         max_timeout=3.0
@@ -192,10 +239,24 @@ async def test_timeout_recovery():
     # Verify timeout decreased
     assert timeout_manager.current_timeout < high_timeout
 
+def test_timeout_p99(timeout_manager_factory):
+    """Test P99 over the rolling response time window."""
+    timeout_manager = timeout_manager_factory(initial_timeout=1.0)
+    assert timeout_manager.p99() == 1.0  # No samples yet
+
+    for i in range(1, 201):
+        timeout_manager.record_result(True, i / 100)
+
+    # Only the last RESPONSE_WINDOW samples (1.01 .. 2.00) are kept
+    assert len(timeout_manager.response_times) == timeout_manager.RESPONSE_WINDOW
+    assert timeout_manager.p99() == 2.0
+    # Timeout still tracks twice the average of the last three samples
+    assert timeout_manager.current_timeout == pytest.approx(2 * 1.99)
+
 @pytest.mark.asyncio
-async def test_timeout_with_concurrent_requests():
+async def test_timeout_with_concurrent_requests(timeout_manager_factory):
     """Test timeout handling with concurrent requests."""
-    timeout_manager = AdaptiveTimeoutManager(initial_timeout=1.0)
+    timeout_manager = timeout_manager_factory(initial_timeout=1.0)
     results = []
     
     async def worker(delay: float):
@@ -207,16 +268,14 @@ async def test_timeout_with_concurrent_requests():
         except asyncio.TimeoutError:
             results.append(("timeout", delay))
     
-    # Run concurrent requests with different delays
-    tasks = [
-        worker(0.5),  # Should succeed
-        worker(1.2),  # Should timeout
-        worker(0.7),  # Should succeed
-        worker(1.5)   # Should timeout
-    ]
-    
-    await asyncio.gather(*tasks, return_exceptions=True)
-    
+    # Run concurrent requests with different delays; worker records its own
+    # timeout, so the group never cancels siblings
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(worker(0.5))  # Should succeed
+        tg.create_task(worker(1.2))  # Should timeout
+        tg.create_task(worker(0.7))  # Should succeed
+        tg.create_task(worker(1.5))  # Should timeout
+
     # Verify results
     successes = [r for r in results if r[0] == "success"]
     timeouts = [r for r in results if r[0] == "timeout"]
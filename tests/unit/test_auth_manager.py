@@ -1,9 +1,12 @@
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, UTC
 import pytest
 
 from social_integrator.auth.auth_manager import TokenInfo, TokenStore, AuthManager, AuthProvider
 
+# Expiry shared by every mock token; computed once per module
+TOKEN_EXPIRES_AT = datetime.now(UTC) + timedelta(hours=1)
+
 class MockAuthProvider(AuthProvider):
     """Mock auth provider for testing."""
     def __init__(self, should_fail=False):
@@ -11,37 +14,37 @@ class MockAuthProvider(AuthProvider):
         self.auth_count = 0
         self.refresh_count = 0
 
-    async def authenticate(self) -> TokenInfo:
+    def _authenticate_sync(self) -> TokenInfo:
         if self.should_fail:
             raise ValueError("Authentication failed")
         self.auth_count += 1
         return TokenInfo(
             access_token=f"mock_token_{self.auth_count}",
-            expires_at=datetime.utcnow() + timedelta(hours=1),
+            expires_at=TOKEN_EXPIRES_AT,
             refresh_token="mock_refresh",
             platform="mock"
         )
 
-    async def refresh(self, token_info: TokenInfo) -> TokenInfo:
+    def _refresh_sync(self, token_info: TokenInfo) -> TokenInfo:
         if self.should_fail:
             raise ValueError("Refresh failed")
         self.refresh_count += 1
         return TokenInfo(
             access_token=f"refreshed_token_{self.refresh_count}",
-            expires_at=datetime.utcnow() + timedelta(hours=1),
+            expires_at=TOKEN_EXPIRES_AT,
             refresh_token=token_info.refresh_token,
             platform="mock"
         )
 
-@pytest.fixture
-def temp_token_file(tmp_path):
-    """Create a temporary token file."""
-    return str(tmp_path / "tokens.json")
+    async def authenticate(self) -> TokenInfo:
+        return self._authenticate_sync()
 
-@pytest.mark.asyncio
-async def test_token_store_operations(temp_token_file):
+    async def refresh(self, token_info: TokenInfo) -> TokenInfo:
+        return self._refresh_sync(token_info)
+
+def test_token_store_operations():
     """Test basic TokenStore operations."""
-    store = TokenStore(temp_token_file)
+    store = TokenStore(backend="memory")
 
     # Store token
     token = TokenInfo(
@@ -60,9 +63,9 @@ async def test_token_store_operations(temp_token_file):
     assert store.get_token("test") is None
 
 @pytest.mark.asyncio
-async def test_auth_manager_token_lifecycle(temp_token_file):
+async def test_auth_manager_token_lifecycle():
     """Test AuthManager token lifecycle."""
-    manager = AuthManager()
+    manager = AuthManager(TokenStore(backend="memory"))
     provider = MockAuthProvider()
     manager.register_provider("mock", provider)
 
@@ -77,9 +80,9 @@ async def test_auth_manager_token_lifecycle(temp_token_file):
     assert provider.auth_count == 1  # Should not have changed
 
 @pytest.mark.asyncio
-async def test_auth_manager_token_refresh(temp_token_file):
+async def test_auth_manager_token_refresh():
     """Test token refresh behavior."""
-    manager = AuthManager()
+    manager = AuthManager(TokenStore(backend="memory"))
     provider = MockAuthProvider()
     manager.register_provider("mock", provider)
 
@@ -87,7 +90,7 @@ async def test_auth_manager_token_refresh(temp_token_file):
     expired_token = TokenInfo(
         access_token="expired",
         platform="mock",
-        expires_at=datetime.utcnow() - timedelta(hours=1),
+        expires_at=datetime.now(UTC) - timedelta(hours=1),
         refresh_token="mock_refresh"
     )
     manager.token_store.store_token(expired_token)
@@ -98,9 +101,9 @@ async def test_auth_manager_token_refresh(temp_token_file):
     assert provider.refresh_count == 1
 
 @pytest.mark.asyncio
-async def test_auth_manager_error_handling(temp_token_file):
+async def test_auth_manager_error_handling():
     """Test error handling in AuthManager."""
-    manager = AuthManager()
+    manager = AuthManager(TokenStore(backend="memory"))
     provider = MockAuthProvider(should_fail=True)
     manager.register_provider("mock", provider)
 
@@ -112,7 +115,7 @@ async def test_auth_manager_error_handling(temp_token_file):
     expired_token = TokenInfo(
         access_token="expired",
         platform="mock",
-        expires_at=datetime.utcnow() - timedelta(hours=1),
+        expires_at=datetime.now(UTC) - timedelta(hours=1),
         refresh_token="mock_refresh"
     )
     manager.token_store.store_token(expired_token)
@@ -14,18 +14,14 @@ def test_platform_config_validation():
     assert config.api_base_url == "https://api.example.com"
     assert config.rate_limit_calls == 100
 
-    # Invalid rate limit values
+@pytest.mark.parametrize("kwargs", [
+    {"rate_limit_calls": -1},  # Negative calls not allowed
+    {"rate_limit_period": -1.0},  # Negative period not allowed
+])
+def test_platform_config_invalid(kwargs):
+    """Test PlatformConfig rejects invalid rate limit values."""
     with pytest.raises(ValidationError):
-        PlatformConfig(
-            api_base_url="https://api.example.com",
-            rate_limit_calls=-1  # Negative calls not allowed
-        )
-
-    with pytest.raises(ValidationError):
-        PlatformConfig(
-            api_base_url="https://api.example.com",
-            rate_limit_period=-1.0  # Negative period not allowed
-        )
+        PlatformConfig(api_base_url="https://api.example.com", **kwargs)
 
 def test_twitter_config():
     """Test TwitterConfig defaults and validation."""
@@ -44,9 +40,14 @@ def test_twitter_config():
     )
     assert custom_config.rate_limit_calls == 100
 
-def test_settings():
+@pytest.fixture(scope="session")
+def base_settings():
+    """Build default Settings once; tests derive variants via model_copy."""
+    return Settings()
+
+def test_settings(base_settings):
     """Test global Settings configuration."""
-    settings = Settings()
+    settings = base_settings
     
     # Check default values
     assert settings.debug is False
@@ -54,12 +55,12 @@ def test_settings():
     assert isinstance(settings.platform_configs["twitter"], TwitterConfig)
 
     # Custom settings
-    custom_settings = Settings(
-        debug=True,
-        platform_configs={
+    custom_settings = base_settings.model_copy(update={
+        "debug": True,
+        "platform_configs": {
             "twitter": TwitterConfig(rate_limit_calls=50)
         }
-    )
+    })
     assert custom_settings.debug is True
     assert custom_settings.platform_configs["twitter"].rate_limit_calls == 50
 
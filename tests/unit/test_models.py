@@ -1,3 +1,9 @@
+import types
+import pytest
+from pydantic import ValidationError
+
+from social_integrator.core.platform import SocialPost
+
 def test_social_post_string_representation():
     """Test string representation of SocialPost."""
     post = SocialPost(
@@ -52,21 +58,36 @@ def test_social_post_url_validation():
     post = SocialPost(content="Test", media_urls=valid_urls)
     assert len(post.media_urls) == 3
 
-    # Invalid URLs
-    invalid_urls = [
-        "not-a-url",
-        "ftp://example.com/image.jpg",
-        "file:///path/to/image.jpg"
-    ]
-    for url in invalid_urls:
-        with pytest.raises(ValidationError):
-            SocialPost(content="Test", media_urls=[url])
+def test_social_post_media_urls_from_iterable():
+    """Test any iterable of media URLs is stored as a tuple."""
+    url = "https://example.com/image.jpg"
+    assert SocialPost(content="Test", media_urls=(u for u in [url])).media_urls == (url,)
+    assert SocialPost(content="Test", media_urls={url}).media_urls == (url,)
 
-def test_social_post_metadata_size_limit():
-    """Test metadata size limits."""
-    # Create large metadata
-    large_metadata = {str(i): "x" * 1000 for i in range(100)}
+def test_social_post_metadata_must_be_mapping():
+    """Test non-mapping metadata is rejected with a clear message."""
+    with pytest.raises(ValidationError, match="Metadata must be a dictionary"):
+        SocialPost(content="Test", metadata=[("key", "value")])
+    post = SocialPost(content="Test", metadata={"key": "value"})
+    assert isinstance(post.metadata, types.MappingProxyType)
 
+@pytest.mark.parametrize("url", [
+    "not-a-url",
+    "ftp://example.com/image.jpg",
+    "file:///path/to/image.jpg"
+])
+def test_social_post_invalid_url(url):
+    """Test invalid media URLs are rejected."""
+    with pytest.raises(ValidationError):
+        SocialPost(content="Test", media_urls=[url])
+
+@pytest.fixture(scope="session")
+def large_metadata():
+    """Build ~100KB of read-only metadata once per session."""
+    return types.MappingProxyType({str(i): "x" * 1000 for i in range(100)})
+
+def test_social_post_metadata_size_limit(large_metadata):
+    """Test metadata size limits."""
     # Should raise validation error for too large metadata
     with pytest.raises(ValidationError):
         SocialPost(content="Test", metadata=large_metadata)
@@ -3,7 +3,9 @@ import pytest
 import time
 from pathlib import Path
 from typing import AsyncGenerator
-from social_integrator.utils.rate_limiting import RateLimiter, RateLimitError, FileRateLimitStorage
+from social_integrator.utils.rate_limiting import (
+    RateLimiter, RateLimitError, FileRateLimitStorage, TokenBucketRateLimiter
+)
 from tests.utils.timing import TimingContext
 
 pytestmark = pytest.mark.asyncio
@@ -16,7 +18,7 @@ def tmp_storage_dir(tmp_path):
     return storage_dir
 
 @pytest.fixture
-async def rate_limiter(tmp_storage_dir, event_loop) -> AsyncGenerator[RateLimiter, None]:
+async def rate_limiter(tmp_storage_dir) -> AsyncGenerator[RateLimiter, None]:
     """Create a rate limiter instance."""
     storage = FileRateLimitStorage(str(tmp_storage_dir))
     limiter = RateLimiter(calls=5, period=1.0, key="test_limiter", storage=storage)
@@ -38,7 +40,7 @@ async def rate_limiter(tmp_storage_dir, event_loop) -> AsyncGenerator[RateLimite
     finally:
         if not limiter._closed:
             try:
-                await asyncio.wait_for(limiter.close(), timeout=0.5)
+                await limiter.close(timeout=0.5)
             except (asyncio.TimeoutError, asyncio.CancelledError, Exception):
                 pass
 
@@ -105,6 +107,56 @@ async def test_persistence(tmp_storage_dir):
         if not limiter1._closed:
             await limiter1.close()
 
+async def test_storage_buffers_saves(tmp_storage_dir):
+    """Test saves are buffered in memory until flushed."""
+    storage = FileRateLimitStorage(str(tmp_storage_dir), flush_interval=60.0)
+    path = tmp_storage_dir / "buffered.msgpack"
+
+    await storage.save_state("buffered", {"total_requests": 1})
+    await storage.save_state("buffered", {"total_requests": 2})
+    assert not path.exists()
+    assert await storage.load_state("buffered") == {"total_requests": 2}
+
+    await storage.close()
+    assert path.exists()
+    assert await storage.load_state("buffered") == {"total_requests": 2}
+
+async def test_storage_ignores_unknown_format(tmp_storage_dir):
+    """Test state files in an unknown format are treated as missing."""
+    storage = FileRateLimitStorage(str(tmp_storage_dir))
+    (tmp_storage_dir / "future.msgpack").write_bytes(b"\xff\x80")
+
+    assert await storage.load_state("future") is None
+
+async def test_token_bucket_persistence(tmp_storage_dir):
+    """Test token bucket state persistence."""
+    storage = FileRateLimitStorage(str(tmp_storage_dir))
+
+    limiter1 = TokenBucketRateLimiter(calls=5, period=1.0, key="bucket_test", storage=storage)
+    for _ in range(3):
+        await limiter1.acquire()
+    await limiter1.close()
+
+    limiter2 = TokenBucketRateLimiter(calls=5, period=1.0, key="bucket_test", storage=storage)
+    try:
+        # Only the two remaining tokens are available
+        for _ in range(2):
+            await limiter2.acquire()
+        with pytest.raises(RateLimitError):
+            await limiter2.acquire()
+    finally:
+        await limiter2.close()
+
+async def test_token_bucket_skips_request_ring():
+    """Test the token bucket keeps no per-request time ring."""
+    limiter = TokenBucketRateLimiter(calls=1000, period=1.0)
+    try:
+        assert not hasattr(limiter, "_request_times")
+        await limiter.acquire()
+        assert limiter.get_current_capacity() == 999
+    finally:
+        await limiter.close()
+
 async def test_wait_for_token(rate_limiter):
     """Test waiting for token availability."""
     async with TimingContext(timeout=2.0) as timing:
@@ -127,6 +179,19 @@ async def test_wait_for_token(rate_limiter):
         got_token = await rate_limiter.wait_for_token(timeout=0.1)
         assert got_token
 
+async def test_wait_for_token_wakes_on_close():
+    """Test closing the limiter wakes waiters instead of letting them sleep."""
+    limiter = RateLimiter(calls=1, period=60.0)
+    await limiter.acquire()
+    
+    async with TimingContext(timeout=1.0):
+        waiter = asyncio.create_task(limiter.wait_for_token())
+        await asyncio.sleep(0.01)
+        await limiter.close()
+        
+        with pytest.raises(RuntimeError, match="closed"):
+            await waiter
+
 async def test_concurrent_access(rate_limiter):
     """Test concurrent access to rate limiter."""
     async def make_request():
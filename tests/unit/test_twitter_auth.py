@@ -91,6 +91,10 @@ async def test_twitter_token_refresh(twitter_auth):
 @pytest.mark.asyncio
 async def test_twitter_auth_errors(twitter_auth):
     """Test error handling in authentication."""
+    # Mock the local server
+    mock_queue = AsyncMock()
+    mock_queue.get.return_value = {"code": "test_code", "state": "state"}
+
     # Mock error response
     mock_response = MagicMock()
     mock_response.ok = False
@@ -102,6 +106,7 @@ async def test_twitter_auth_errors(twitter_auth):
 
     with patch("aiohttp.ClientSession", return_value=mock_session), \
          patch("webbrowser.open"), \
+         patch.object(twitter_auth, "_start_local_server", return_value=mock_queue), \
          pytest.raises(ValueError, match="Token exchange failed"):
 
         await twitter_auth.authenticate()
@@ -1,14 +1,17 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from social_integrator.platforms.twitter import TwitterAPI
 from social_integrator.core.platform import SocialPost
 from social_integrator.utils.rate_limiting import AsyncBatcher
+from tests.utils.fakes import FakeResponse, FakeSession
 
 @pytest.fixture
-def twitter_api():
+async def twitter_api():
     """Create a TwitterAPI instance."""
-    return TwitterAPI(auth_token="test_token")
+    api = TwitterAPI(auth_token="test_token")
+    yield api
+    await api.close()
 
 @pytest.mark.asyncio
 async def test_batch_post_processing(twitter_api):
@@ -60,17 +63,17 @@ async def test_batch_media_upload(twitter_api):
         ]
     )
 
-    # Mock media upload responses
-    mock_upload_responses = [
-        {"media_id_string": f"media_{i}"}
-        for i in range(2)
-    ]
+    # Mock tweet creation response
+    mock_session = FakeSession(responses={
+        "post": FakeResponse(payload={"data": {"id": "tweet_1"}})
+    })
 
     # Mock upload method
     twitter_api._upload_media = AsyncMock(return_value=["media_1", "media_2"])
 
     # Process post with media
-    await twitter_api.post(post)
+    with patch.object(twitter_api, "session", mock_session):
+        await twitter_api.post(post)
 
     # Verify media was uploaded
     twitter_api._upload_media.assert_called_once_with(post.media_urls)
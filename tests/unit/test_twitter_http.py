@@ -1,36 +1,63 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 import asyncio
+import weakref
 import aiohttp
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 
-from social_integrator.platforms.twitter import TwitterAPI
+from social_integrator.platforms import twitter
+from social_integrator.platforms.twitter import TwitterAPI, close_shared_connector
 from social_integrator.core.platform import PlatformError, RateLimitError
+from tests.utils.fakes import FakeResponse, FakeSession
 
 @pytest.fixture
-def twitter_api():
+async def twitter_api():
     """Create a TwitterAPI instance."""
-    return TwitterAPI(auth_token="test_token")
+    api = TwitterAPI(auth_token="test_token")
+    yield api
+    await api.close()
 
 @pytest.mark.asyncio
 async def test_handle_rate_limit_response(twitter_api):
     """Test handling of rate limit responses."""
     # Create mock response with rate limit headers
-    mock_response = MagicMock()
-    mock_response.status = 429
-    mock_response.headers = {"Retry-After": "60"}
+    mock_response = FakeResponse(status=429, headers={"Retry-After": "60"})
 
     with pytest.raises(RateLimitError) as exc:
         await twitter_api._handle_response(mock_response)
 
     assert "60" in str(exc.value)  # Should include retry delay
 
+@pytest.mark.asyncio
+async def test_handle_rate_limit_http_date(twitter_api):
+    """Test a Retry-After header in HTTP-date form."""
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+    mock_response = FakeResponse(status=429, headers={
+        "Retry-After": format_datetime(retry_at, usegmt=True)
+    })
+
+    with pytest.raises(RateLimitError) as exc:
+        await twitter_api._handle_response(mock_response)
+
+    assert 118 <= exc.value.retry_after <= 120
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, {"Retry-After": "soon"}])
+async def test_handle_rate_limit_default_delay(twitter_api, headers):
+    """Test a missing or malformed Retry-After falls back to 60 seconds."""
+    mock_response = FakeResponse(status=429, headers=headers)
+
+    with pytest.raises(RateLimitError) as exc:
+        await twitter_api._handle_response(mock_response)
+
+    assert exc.value.retry_after == 60
+
 @pytest.mark.asyncio
 async def test_handle_error_response(twitter_api):
     """Test handling of error responses."""
     # Create mock error response
-    mock_response = MagicMock()
-    mock_response.status = 400
-    mock_response.json = AsyncMock(return_value={
+    mock_response = FakeResponse(status=400, payload={
         "errors": [{"message": "Invalid request"}]
     })
 
@@ -41,11 +68,7 @@ async def test_handle_error_response(twitter_api):
 async def test_handle_invalid_json_response(twitter_api):
     """Test handling of invalid JSON responses."""
     # Create mock response with invalid JSON
-    mock_response = MagicMock()
-    mock_response.json = AsyncMock(side_effect=aiohttp.ContentTypeError(
-        None, None
-    ))
-    mock_response.text = AsyncMock(return_value="Invalid JSON")
+    mock_response = FakeResponse(body=b"Invalid JSON")
 
     with pytest.raises(PlatformError, match="Invalid response"):
         await twitter_api._handle_response(mock_response)
@@ -54,9 +77,7 @@ async def test_handle_invalid_json_response(twitter_api):
 async def test_handle_success_response(twitter_api):
     """Test handling of successful responses."""
     # Create mock success response
-    mock_response = MagicMock()
-    mock_response.ok = True
-    mock_response.json = AsyncMock(return_value={
+    mock_response = FakeResponse(payload={
         "data": {"id": "123"}
     })
 
@@ -67,8 +88,9 @@ async def test_handle_success_response(twitter_api):
 async def test_handle_network_errors():
     """Test handling of network-related errors."""
     # Mock session that raises network error
-    mock_session = AsyncMock()
-    mock_session.post.side_effect = aiohttp.ClientError("Network error")
+    mock_session = FakeSession(responses={
+        "post": aiohttp.ClientError("Network error")
+    })
 
     with patch("aiohttp.ClientSession", return_value=mock_session):
         api = TwitterAPI(auth_token="test_token")
@@ -79,8 +101,9 @@ async def test_handle_network_errors():
 async def test_handle_timeout():
     """Test handling of timeout errors."""
     # Mock session that raises timeout
-    mock_session = AsyncMock()
-    mock_session.post.side_effect = asyncio.TimeoutError()
+    mock_session = FakeSession(responses={
+        "post": asyncio.TimeoutError()
+    })
 
     with patch("aiohttp.ClientSession", return_value=mock_session):
         api = TwitterAPI(auth_token="test_token")
@@ -89,7 +112,7 @@ async def test_handle_timeout():
 @pytest.mark.asyncio
 async def test_session_lifecycle():
     """Test proper session creation and cleanup."""
-    mock_session = AsyncMock()
+    mock_session = FakeSession()
 
     with patch("aiohttp.ClientSession", return_value=mock_session):
         api = TwitterAPI(auth_token="test_token")
@@ -100,8 +123,36 @@ async def test_session_lifecycle():
             assert hasattr(api, "session")
 
         # Session should be closed
-        mock_session.close.assert_called_once()
+        assert mock_session.close_count == 1
 
         # Test manual cleanup
         await api.close()
-        assert mock_session.close.call_count == 2
+        assert mock_session.close_count == 2
+
+@pytest.mark.asyncio
+async def test_shared_connector(monkeypatch):
+    """Test clients without a connector share one, closed with the last client."""
+    # Start from no shared connector, whatever earlier tests left open
+    monkeypatch.setattr(twitter, "_shared_connectors", weakref.WeakKeyDictionary())
+    monkeypatch.setattr(twitter, "_shared_connector_clients", weakref.WeakKeyDictionary())
+    api1 = TwitterAPI(auth_token="test_token")
+    api2 = TwitterAPI(auth_token="test_token")
+    connector = api1.session.connector
+    try:
+        assert api2.session.connector is connector
+
+        await api1.close()
+        assert not connector.closed
+        await api2.close()
+        assert connector.closed
+        await api2.close()  # Closing again releases nothing more
+    finally:
+        await close_shared_connector()
+
+    # A new client starts a fresh shared connector
+    api3 = TwitterAPI(auth_token="test_token")
+    try:
+        assert not api3.session.connector.closed
+        assert api3.session.connector is not connector
+    finally:
+        await api3.close()
@@ -1,34 +1,35 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 import aiohttp
 import asyncio
 
 from social_integrator.platforms.twitter import TwitterAPI
 from social_integrator.core.platform import PlatformError, SocialPost
+from tests.utils.fakes import FakeResponse, FakeSession
 
 @pytest.fixture
-def twitter_api():
+async def twitter_api():
     """Create a TwitterAPI instance."""
-    return TwitterAPI(auth_token="test_token")
+    api = TwitterAPI(auth_token="test_token")
+    yield api
+    await api.close()
 
 @pytest.mark.asyncio
 async def test_media_upload(twitter_api):
     """Test media upload functionality."""
     # Mock successful media download
-    mock_media_response = MagicMock()
-    mock_media_response.read = AsyncMock(return_value=b"fake_image_data")
+    mock_media_response = FakeResponse(body=b"fake_image_data")
 
     # Mock successful media upload
-    mock_upload_response = MagicMock()
-    mock_upload_response.ok = True
-    mock_upload_response.json = AsyncMock(return_value={
+    mock_upload_response = FakeResponse(payload={
         "media_id_string": "123456789"
     })
 
     # Mock session methods
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_media_response
-    mock_session.post.return_value.__aenter__.return_value = mock_upload_response
+    mock_session = FakeSession(responses={
+        "get": mock_media_response,
+        "post": mock_upload_response
+    })
 
     with patch.object(twitter_api, "session", mock_session):
         media_ids = await twitter_api._upload_media([
@@ -42,8 +43,9 @@ async def test_media_upload(twitter_api):
 async def test_media_download_error(twitter_api):
     """Test handling of media download errors."""
     # Mock failed media download
-    mock_session = AsyncMock()
-    mock_session.get.side_effect = aiohttp.ClientError("Download failed")
+    mock_session = FakeSession(responses={
+        "get": aiohttp.ClientError("Download failed")
+    })
 
     with patch.object(twitter_api, "session", mock_session):
         with pytest.raises(PlatformError, match="Failed to download media"):
@@ -55,18 +57,16 @@ async def test_media_download_error(twitter_api):
 async def test_media_upload_error(twitter_api):
     """Test handling of media upload errors."""
     # Mock successful download but failed upload
-    mock_media_response = MagicMock()
-    mock_media_response.read = AsyncMock(return_value=b"fake_image_data")
+    mock_media_response = FakeResponse(body=b"fake_image_data")
 
-    mock_upload_response = MagicMock()
-    mock_upload_response.ok = False
-    mock_upload_response.json = AsyncMock(return_value={
+    mock_upload_response = FakeResponse(status=400, payload={
         "errors": [{"message": "Upload failed"}]
     })
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_media_response
-    mock_session.post.return_value.__aenter__.return_value = mock_upload_response
+    mock_session = FakeSession(responses={
+        "get": mock_media_response,
+        "post": mock_upload_response
+    })
 
     with patch.object(twitter_api, "session", mock_session):
         with pytest.raises(PlatformError, match="Upload failed"):
@@ -78,20 +78,17 @@ async def test_media_upload_error(twitter_api):
 async def test_multiple_media_upload(twitter_api):
     """Test uploading multiple media files."""
     # Mock successful media operations
-    mock_media_response = MagicMock()
-    mock_media_response.read = AsyncMock(return_value=b"fake_image_data")
+    mock_media_response = FakeResponse(body=b"fake_image_data")
 
-    mock_upload_response = MagicMock()
-    mock_upload_response.ok = True
     responses = [
-        {"media_id_string": f"id_{i}"}
+        FakeResponse(payload={"media_id_string": f"id_{i}"})
         for i in range(4)
     ]
-    mock_upload_response.json = AsyncMock(side_effect=responses)
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_media_response
-    mock_session.post.return_value.__aenter__.return_value = mock_upload_response
+    mock_session = FakeSession(responses={
+        "get": mock_media_response,
+        "post": responses
+    })
 
     with patch.object(twitter_api, "session", mock_session):
         media_ids = await twitter_api._upload_media([
@@ -101,6 +98,34 @@ async def test_multiple_media_upload(twitter_api):
 
         assert len(media_ids) == 4
         assert all(f"id_{i}" in media_ids for i in range(4))
+
+@pytest.mark.asyncio
+async def test_media_upload_failure_cancels_others(twitter_api):
+    """Test a failed upload cancels the uploads still in flight."""
+    cancelled = []
+
+    async def upload_one(url):
+        if url.endswith("bad.jpg"):
+            raise PlatformError("Failed to upload media: boom")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    with patch.object(twitter_api, "_upload_one", upload_one):
+        with pytest.raises(PlatformError, match="boom"):
+            await twitter_api._upload_media([
+                "https://example.com/slow1.jpg",
+                "https://example.com/bad.jpg",
+                "https://example.com/slow2.jpg"
+            ])
+
+    assert sorted(cancelled) == [
+        "https://example.com/slow1.jpg",
+        "https://example.com/slow2.jpg"
+    ]
+
 @pytest.mark.asyncio
 async def test_media_validation():
     """Test media validation rules."""
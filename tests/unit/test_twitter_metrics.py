@@ -1,173 +1,287 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-import aiohttp
 import asyncio
+from types import SimpleNamespace
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import patch
 
-from social_integrator.platforms.twitter import TwitterAPI
+from social_integrator.platforms import twitter
+from social_integrator.platforms.twitter import TwitterAPI, _shared_connector
 from social_integrator.core.platform import PlatformError
+from social_integrator.core.config import TwitterConfig
+
+# Test server state: tweet ID -> public metrics, forced response status,
+# client port of each lookup received and [current, peak] requests in flight,
+# all reset per test, plus the client ports of every lookup in the module
+TWEETS = web.AppKey("tweets", dict)
+STATUS = web.AppKey("status", int)
+REQUESTS = web.AppKey("requests", list)
+IN_FLIGHT = web.AppKey("in_flight", list)
+PORTS = web.AppKey("ports", set)
+
+@web.middleware
+async def track_in_flight(request: web.Request, handler) -> web.StreamResponse:
+    """Hold each request briefly, recording how many overlap."""
+    in_flight = request.app[IN_FLIGHT]
+    in_flight[0] += 1
+    in_flight[1] = max(in_flight)
+    try:
+        await asyncio.sleep(0.01)
+        return await handler(request)
+    finally:
+        in_flight[0] -= 1
+
+@pytest.fixture(scope="module")
+async def twitter_server_module():
+    """Serve tweet lookup and deletion endpoints backed by `TWEETS`."""
+    async def lookup(request: web.Request) -> web.Response:
+        port = request.transport.get_extra_info("peername")[1]
+        request.app[REQUESTS].append(port)
+        request.app[PORTS].add(port)
+        status = request.app[STATUS]
+        if status == 429:
+            return web.json_response(
+                {"title": "Too Many Requests"},
+                status=429,
+                headers={"Retry-After": "60"}
+            )
+
+        tweets = request.app[TWEETS]
+        ids = request.query["ids"].split(",")
+        return web.json_response({
+            "data": [
+                {"id": tweet_id, "public_metrics": tweets[tweet_id]}
+                for tweet_id in ids if tweet_id in tweets
+            ],
+            "errors": [
+                {"value": tweet_id, "message": "Tweet not found"}
+                for tweet_id in ids if tweet_id not in tweets
+            ]
+        })
+
+    async def delete(request: web.Request) -> web.Response:
+        request.app[TWEETS].pop(request.match_info["tweet_id"], None)
+        return web.json_response({"data": {"deleted": True}})
+
+    app = web.Application(middlewares=[track_in_flight])
+    app[PORTS] = set()
+    app.router.add_get("/2/tweets", lookup)
+    app.router.add_delete("/2/tweets/{tweet_id}", delete)
+
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+@pytest.fixture
+def twitter_server(twitter_server_module):
+    """Provide the module's test server with its state reset."""
+    app = twitter_server_module.app
+    app[TWEETS] = {}
+    app[STATUS] = 200
+    app[REQUESTS] = []
+    app[IN_FLIGHT] = [0, 0]
+    yield twitter_server_module
 
 @pytest.fixture
-def twitter_api():
-    """Create a TwitterAPI instance."""
-    return TwitterAPI(auth_token="test_token")
+async def twitter_api(twitter_server):
+    """Create a TwitterAPI instance pointed at the test server."""
+    api = TwitterAPI(auth_token="test_token")
+    api.config = TwitterConfig(api_base_url=str(twitter_server.make_url("/2")))
+    yield api
+    await api.close()
 
 @pytest.mark.asyncio
-async def test_get_metrics(twitter_api):
+async def test_get_metrics(twitter_api, twitter_server):
     """Test getting post metrics."""
-    # Mock successful metrics response
-    mock_response = MagicMock()
-    mock_response.ok = True
-    mock_response.json = AsyncMock(return_value={
-        "data": {
-            "public_metrics": {
-                "retweet_count": 10,
-                "reply_count": 5,
-                "like_count": 20,
-                "quote_count": 3
-            }
-        }
-    })
+    twitter_server.app[TWEETS]["123456789"] = {
+        "retweet_count": 10,
+        "reply_count": 5,
+        "like_count": 20,
+        "quote_count": 3
+    }
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    metrics = await twitter_api.get_metrics("123456789")
 
-    with patch.object(twitter_api, "session", mock_session):
-        metrics = await twitter_api.get_metrics("123456789")
-
-        assert metrics["retweet_count"] == 10
-        assert metrics["reply_count"] == 5
-        assert metrics["like_count"] == 20
-        assert metrics["quote_count"] == 3
+    assert metrics["retweets"] == 10
+    assert metrics["replies"] == 5
+    assert metrics["likes"] == 20
+    assert metrics["quotes"] == 3
 
 @pytest.mark.asyncio
 async def test_get_metrics_not_found(twitter_api):
     """Test getting metrics for non-existent post."""
-    # Mock 404 response
-    mock_response = MagicMock()
-    mock_response.status = 404
-    mock_response.json = AsyncMock(return_value={
-        "errors": [{"message": "Tweet not found"}]
-    })
+    with pytest.raises(PlatformError, match="Tweet not found"):
+        await twitter_api.get_metrics("nonexistent")
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+@pytest.mark.asyncio
+async def test_get_metrics_rate_limit(twitter_api, twitter_server):
+    """Test rate limit handling for metrics."""
+    twitter_server.app[STATUS] = 429
 
-    with patch.object(twitter_api, "session", mock_session):
-        with pytest.raises(PlatformError, match="Tweet not found"):
-            await twitter_api.get_metrics("nonexistent")
+    with pytest.raises(PlatformError, match="Rate limit exceeded"):
+        await twitter_api.get_metrics("123456789")
 
 @pytest.mark.asyncio
-async def test_get_metrics_rate_limit(twitter_api):
-    """Test rate limit handling for metrics."""
-    # Mock rate limit response
-    mock_response = MagicMock()
-    mock_response.status = 429
-    mock_response.headers = {"Retry-After": "60"}
+async def test_get_metrics_batch(twitter_api, twitter_server):
+    """Test getting metrics for multiple posts."""
+    for i in range(3):
+        twitter_server.app[TWEETS][f"tweet_{i}"] = {
+            "retweet_count": i,
+            "like_count": i * 2
+        }
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    tweet_ids = [f"tweet_{i}" for i in range(3)]
+    metrics = await twitter_api.get_metrics_batch(tweet_ids)
 
-    with patch.object(twitter_api, "session", mock_session):
-        with pytest.raises(PlatformError, match="Rate limit exceeded"):
-            await twitter_api.get_metrics("123456789")
+    assert len(metrics) == 3
+    for i, metric in enumerate(metrics):
+        assert metric["retweets"] == i
+        assert metric["likes"] == i * 2
+    assert len(twitter_server.app[REQUESTS]) == 1
 
 @pytest.mark.asyncio
-async def test_get_metrics_batch(twitter_api):
-    """Test getting metrics for multiple posts."""
-    # Mock successful batch metrics response
-    mock_response = MagicMock()
-    mock_response.ok = True
-    mock_response.json = AsyncMock(return_value={
-        "data": [
-            {
-                "id": f"tweet_{i}",
-                "public_metrics": {
-                    "retweet_count": i,
-                    "like_count": i * 2
-                }
-            }
-            for i in range(3)
-        ]
-    })
+async def test_get_metrics_batch_fetches_chunks_concurrently(twitter_api, twitter_server):
+    """Test lookups for more than one chunk of IDs are sent together."""
+    tweet_ids = [f"tweet_{i}" for i in range(250)]
+    for i, tweet_id in enumerate(tweet_ids):
+        twitter_server.app[TWEETS][tweet_id] = {"like_count": i}
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    metrics = await twitter_api.get_metrics_batch(tweet_ids)
 
-    with patch.object(twitter_api, "session", mock_session):
-        tweet_ids = [f"tweet_{i}" for i in range(3)]
-        metrics = await twitter_api.get_metrics_batch(tweet_ids)
+    assert [m["likes"] for m in metrics] == list(range(250))
+    assert len(twitter_server.app[REQUESTS]) == 3  # 100 + 100 + 50
+    assert twitter_server.app[IN_FLIGHT][1] == 3
 
-        assert len(metrics) == 3
-        for i, metric in enumerate(metrics):
-            assert metric["retweet_count"] == i
-            assert metric["like_count"] == i * 2
 @pytest.mark.asyncio
-async def test_metrics_caching(twitter_api):
+async def test_metrics_caching(twitter_api, twitter_server):
     """Test metrics caching functionality."""
-    # Mock successful metrics response
-    mock_response = MagicMock()
-    mock_response.ok = True
-    mock_response.json = AsyncMock(return_value={
-        "data": {
-            "public_metrics": {
-                "retweet_count": 10,
-                "like_count": 20
-            }
-        }
-    })
+    twitter_server.app[TWEETS]["123456789"] = {
+        "retweet_count": 10,
+        "like_count": 20
+    }
+    requests = twitter_server.app[REQUESTS]
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    # First call should hit the API
+    metrics1 = await twitter_api.get_metrics("123456789")
+    assert len(requests) == 1
 
-    with patch.object(twitter_api, "session", mock_session):
-        # First call should hit the API
-        metrics1 = await twitter_api.get_metrics("123456789")
-        assert mock_session.get.call_count == 1
+    # Second call should use cached value
+    metrics2 = await twitter_api.get_metrics("123456789")
+    assert len(requests) == 1  # No additional API call
+    assert metrics1 == metrics2  # Same data returned
 
-        # Second call within cache time should use cached value
-        metrics2 = await twitter_api.get_metrics("123456789")
-        assert mock_session.get.call_count == 1  # No additional API call
-        assert metrics1 == metrics2  # Same data returned
+    # Writing through the client invalidates the cached metrics
+    await twitter_api.delete_post("123456789")
 
-        # Wait for cache to expire
-        await asyncio.sleep(twitter_api.config.metrics_cache_ttl + 0.1)
-
-        # Call after cache expiry should hit API again
-        metrics3 = await twitter_api.get_metrics("123456789")
-        assert mock_session.get.call_count == 2
+    # Call after invalidation should hit API again
+    with pytest.raises(PlatformError, match="Tweet not found"):
+        await twitter_api.get_metrics("123456789")
+    assert len(requests) == 2
 
 @pytest.mark.asyncio
-async def test_metrics_cache_invalidation(twitter_api):
+async def test_metrics_cache_invalidation(twitter_api, twitter_server):
     """Test metrics cache invalidation."""
-    # Mock responses
-    responses = [
-        {
-            "data": {
-                "public_metrics": {
-                    "retweet_count": i * 10,
-                    "like_count": i * 20
-                }
-            }
-        }
-        for i in range(1, 3)
-    ]
+    tweets = twitter_server.app[TWEETS]
+    tweets["123456789"] = {"retweet_count": 10, "like_count": 20}
+
+    # Get initial metrics
+    metrics1 = await twitter_api.get_metrics("123456789")
+    assert metrics1["retweets"] == 10
+
+    # Metrics change on the server, then the cache is invalidated
+    tweets["123456789"] = {"retweet_count": 20, "like_count": 40}
+    twitter_api.invalidate_metrics_cache("123456789")
+
+    # Get metrics again (should hit API with new data)
+    metrics2 = await twitter_api.get_metrics("123456789")
+    assert metrics2["retweets"] == 20
+    assert len(twitter_server.app[REQUESTS]) == 2
+
+@pytest.mark.asyncio
+async def test_get_metrics_coalesces_concurrent_calls(twitter_api, twitter_server):
+    """Test concurrent get_metrics calls share one batch lookup."""
+    for i in range(3):
+        twitter_server.app[TWEETS][f"tweet_{i}"] = {"like_count": i}
+
+    metrics = await asyncio.gather(*(
+        twitter_api.get_metrics(f"tweet_{i}") for i in range(3)
+    ))
+
+    assert [m["likes"] for m in metrics] == [0, 1, 2]
+    assert len(twitter_server.app[REQUESTS]) == 1
+
+@pytest.mark.asyncio
+async def test_get_metrics_joins_inflight_lookup(twitter_api, twitter_server):
+    """Test callers arriving mid-lookup share it instead of sending another."""
+    twitter_server.app[TWEETS]["123456789"] = {"like_count": 20}
+    in_flight = twitter_server.app[IN_FLIGHT]
 
-    mock_response = MagicMock()
-    mock_response.ok = True
-    mock_response.json = AsyncMock(side_effect=responses)
+    first = asyncio.create_task(twitter_api.get_metrics("123456789"))
+    while not in_flight[0]:
+        await asyncio.sleep(0.001)
+    # The first lookup is now held by the server, past the batch window
+    metrics = await asyncio.gather(first, *(
+        twitter_api.get_metrics("123456789") for _ in range(19)
+    ))
 
-    mock_session = AsyncMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    assert [m["likes"] for m in metrics] == [20] * 20
+    assert len(twitter_server.app[REQUESTS]) == 1
+    assert twitter_api._metrics_cache["123456789"].ttl == twitter_api.config.metrics_cache_min_age
+    assert not twitter_api._metrics_inflight
 
-    with patch.object(twitter_api, "session", mock_session):
-        # Get initial metrics
-        metrics1 = await twitter_api.get_metrics("123456789")
-        assert metrics1["retweet_count"] == 10
+@pytest.mark.asyncio
+async def test_metrics_ttl_adapts_to_change_rate(twitter_api, twitter_server, monkeypatch):
+    """Test unchanged metrics are refreshed less and less often."""
+    twitter_api.config = twitter_api.config.model_copy(update={
+        "metrics_cache_min_age": 0.01,
+        "metrics_cache_max_age": 1.0
+    })
+    twitter_server.app[TWEETS]["123456789"] = {"like_count": 20}
+
+    # Virtual clock for the cache only; the event loop keeps real time
+    now = 0.0
+    monkeypatch.setattr(twitter, "time", SimpleNamespace(monotonic=lambda: now))
+
+    # Poll every 10ms for 300ms; a fixed 10ms TTL would refetch 30 times
+    for i in range(30):
+        now = i * 0.01
+        await twitter_api.get_metrics("123456789")
+
+    # TTL doubles on every unchanged refresh: 10, 20, 40, 80, 160ms...
+    assert len(twitter_server.app[REQUESTS]) <= 6
+    assert twitter_api._metrics_cache["123456789"].ttl > 0.01
+
+@pytest.mark.asyncio
+async def test_metrics_reuse_keep_alive_connection(twitter_api, twitter_server):
+    """Test lookups go through the shared connector over pooled connections."""
+    for i in range(3):
+        twitter_server.app[TWEETS][f"tweet_{i}"] = {"like_count": i}
+    # Earlier tests in the module may have left connections in the pool
+    pooled = set(twitter_server.app[PORTS])
+
+    for i in range(3):
+        await twitter_api.get_metrics_batch([f"tweet_{i}"])
+
+    assert twitter_api.session.connector is _shared_connector()
+    assert len(set(twitter_server.app[REQUESTS]) - pooled) <= 1
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_bounded(twitter_server):
+    """Test a client keeps at most `max_concurrent_requests` in flight."""
+    config = TwitterConfig(
+        api_base_url=str(twitter_server.make_url("/2")),
+        max_concurrent_requests=2
+    )
+    with patch("social_integrator.platforms.twitter.get_platform_config", return_value=config):
+        api = TwitterAPI(auth_token="test_token")
 
-        # Invalidate cache
-        twitter_api.invalidate_metrics_cache("123456789")
+    try:
+        results = await asyncio.gather(*(
+            api.delete_post(f"tweet_{i}") for i in range(6)
+        ))
+    finally:
+        await api.close()
 
-        # Get metrics again (should hit API with new data)
-        metrics2 = await twitter_api.get_metrics("123456789")
-        assert metrics2["retweet_count"] == 20
-        assert mock_session.get.call_count == 2
+    assert results == [True] * 6
+    assert twitter_server.app[IN_FLIGHT][1] == 2
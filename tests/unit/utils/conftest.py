@@ -1,53 +1,46 @@
 import pytest
 import asyncio
-from typing import AsyncGenerator
-import warnings
-
-@pytest.fixture(scope="function")
-async def event_loop() -> AsyncGenerator[asyncio.AbstractEventLoop, None]:
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    # Enable debug mode for better error messages
-    loop.set_debug(True)
-    
-    yield loop
-    
-    # Clean up pending tasks
-    pending = asyncio.all_tasks(loop)
-    if pending:
-        # Give tasks a chance to complete
-        await asyncio.gather(*pending, return_exceptions=True)
-        
-        # Cancel any remaining tasks
-        for task in pending:
-            if not task.done():
-                task.cancel()
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore", RuntimeWarning)
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-    
-    await loop.shutdown_asyncgens()
-    await asyncio.sleep(0)  # Final cleanup
-    loop.close()
+
+from social_integrator.utils.rate_limiting import AsyncBatcher, RateLimiter
+from tests.utils.fakes import FakeClock
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Drive every rate limiter from a manually advanced clock."""
+    clock = FakeClock()
+    monkeypatch.setattr(RateLimiter, "time_func", staticmethod(clock))
+    # Timing is deterministic now, so retry_with_backoff runs tests once
+    monkeypatch.setenv("PYTEST_DETERMINISTIC", "1")
+    return clock
 
 @pytest.fixture
-async def batcher_cleanup():
-    """Cleanup fixture for AsyncBatcher tests."""
+async def make_batcher():
+    """Build batchers with test defaults, closing them all on teardown.
+
+    Defaults are ``batch_size=2`` and ``batch_timeout=0.1``; keyword
+    arguments override them.
+    """
+    created = []
+
+    def _make(process_func, **overrides):
+        options = {"batch_size": 2, "batch_timeout": 0.1, **overrides}
+        batcher = AsyncBatcher(process_func=process_func, **options)
+        created.append(batcher)
+        return batcher
+
+    yield _make
+    await asyncio.gather(*(batcher.close() for batcher in created))
+
+@pytest.fixture(scope="module", autouse=True)
+async def no_leaked_batcher_workers():
+    """Fail the module if a test left AsyncBatcher workers running.
+
+    `make_batcher` closes the batchers it builds, so this only checks once per
+    module instead of cancelling leftovers after every test.
+    """
     yield
-    # Clean up any remaining tasks
-    loop = asyncio.get_event_loop()
-    pending = asyncio.all_tasks(loop)
-    for task in pending:
-        if not task.done() and task.get_name().startswith('AsyncBatcher'):
-            task.cancel()
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", RuntimeWarning)
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+    leaked = [
+        task.get_name() for task in asyncio.all_tasks()
+        if task.get_name().startswith("AsyncBatcher") and not task.done()
+    ]
+    assert not leaked, f"AsyncBatcher workers left running: {leaked}"
@@ -1,5 +1,4 @@
 import pytest
-import random
 from social_integrator.utils.backoff import AdaptiveBackoffManager
 
 def test_backoff_basic():
@@ -25,8 +24,8 @@ def test_backoff_max_delay():
 
 def test_backoff_jitter():
     """Test that jitter is applied correctly."""
-    random.seed(42)  # For reproducible tests
     backoff = AdaptiveBackoffManager(base_delay=0.1, max_delay=1.0)
+    backoff._rng.seed(42)  # For reproducible tests
     backoff.jitter_factor = 0.1  # 10% jitter
     
     # Get multiple delays for the same attempt
@@ -124,8 +123,8 @@ def test_backoff_error_tracking():
 
 def test_backoff_delay_sequence():
     """Test sequence of delays with exponential backoff."""
-    random.seed(42)  # For reproducible tests
     backoff = AdaptiveBackoffManager(base_delay=0.1, max_delay=1.0)
+    backoff._rng.seed(42)  # For reproducible tests
     backoff.jitter_factor = 0  # Disable jitter for predictable testing
     
     # Get sequence of delays
@@ -140,8 +139,8 @@ def test_backoff_delay_sequence():
 
 def test_backoff_combined_strategy():
     """Test combined backoff strategy with all features."""
-    random.seed(42)  # For reproducible tests
     backoff = AdaptiveBackoffManager(base_delay=0.1, max_delay=1.0)
+    backoff._rng.seed(42)  # For reproducible tests
     
     # Simulate a sequence of events
     scenarios = [
@@ -164,3 +163,23 @@ def test_backoff_combined_strategy():
     assert all(0.09 <= d <= 1.0 for d in delays)  # All delays within bounds
     assert backoff.success_streak > 0
     assert backoff.failure_streak == 0
+
+def test_backoff_delay_table():
+    """Test precomputed delays match capped exponential backoff."""
+    backoff = AdaptiveBackoffManager(base_delay=0.3, max_delay=5.0)
+    backoff.jitter_factor = 0
+    
+    assert backoff._delays == [0.3, 0.6, 1.2, 2.4, 4.8, 5.0]
+    for attempt in range(20):
+        assert backoff.get_delay(attempt) == min(0.3 * 2 ** attempt, 5.0)
+
+def test_backoff_delay_table_follows_bounds():
+    """Test changing the delay bounds after construction takes effect."""
+    backoff = AdaptiveBackoffManager(base_delay=0.1, max_delay=1.0)
+    backoff.jitter_factor = 0
+    
+    backoff.max_delay = 10.0
+    assert backoff.get_delay(6) == pytest.approx(6.4)
+    
+    backoff.base_delay = 0.2
+    assert backoff.get_delay(2) == pytest.approx(0.8)
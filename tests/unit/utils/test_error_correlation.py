@@ -162,3 +162,21 @@ def test_correlation_with_gaps():
     
     score = analyzer.get_correlation_score()
     assert score > 0  # Should still show correlation despite gaps
+
+def test_results_cached_until_new_error():
+    """Test score and patterns are reused until another error is added."""
+    analyzer = ErrorCorrelationAnalyzer(window_size=5)
+    current_time = time.monotonic()
+    analyzer.add_error("timeout", current_time)
+    analyzer.add_error("timeout", current_time + 0.1)
+    
+    patterns = analyzer.get_error_patterns()
+    assert analyzer.get_error_patterns() is patterns
+    assert analyzer.get_correlation_score() == analyzer.get_correlation_score() == 1.0
+    
+    analyzer.add_error("network", current_time + 0.2)
+    assert analyzer.get_error_patterns() == {
+        ("timeout", "timeout"): 0.5,
+        ("timeout", "network"): 0.5
+    }
+    assert analyzer.get_correlation_score() == pytest.approx(0.5)
@@ -1,3 +1,4 @@
+import json
 import pytest
 import time
 from social_integrator.utils.metrics import RetryMetricsCollector
@@ -88,8 +89,9 @@ def test_response_time_analysis():
     metrics = collector.get_metrics()
     
     assert metrics["avg_response_time"] == pytest.approx(0.225, abs=0.01)  # (0.1 + 0.5 + 0.2 + 0.1) / 4
-    assert all(0.1 <= sum(times)/len(times) <= 0.5 
-              for times in collector.response_times.values())
+    means = collector.get_response_time_means()
+    assert means.keys() == {"req1", "req2", "req3", "req4"}
+    assert all(0.1 <= mean <= 0.5 for mean in means.values())
 
 def test_retry_distribution():
     """Test distribution of retry counts."""
@@ -123,6 +125,8 @@ def test_time_since_last_success():
     metrics = collector.get_metrics()
     assert metrics["time_since_last_success"] is not None
     assert metrics["time_since_last_success"] < 0.2  # Should be close to our sleep time
+    # Public timestamp stays on the time.monotonic() scale
+    assert start_time < collector.last_success_time <= time.monotonic()
 
 def test_empty_metrics():
     """Test metrics when no data is collected."""
@@ -167,3 +171,56 @@ def test_error_distribution_calculation():
     assert distribution["timeout"] == pytest.approx(4/7, abs=0.01)  # 4 out of 7 errors
     assert distribution["network"] == pytest.approx(2/7, abs=0.01)  # 2 out of 7 errors
     assert distribution["rate_limit"] == pytest.approx(1/7, abs=0.01)  # 1 out of 7 errors
+
+def test_retry_interval_capacity():
+    """Test only the most recent retry intervals are averaged."""
+    collector = RetryMetricsCollector(interval_capacity=3)
+    
+    for interval in [10.0, 1.0, 2.0, 3.0]:
+        collector.record_retry_interval(interval)
+    
+    assert list(collector.retry_intervals) == [1.0, 2.0, 3.0]
+    assert collector.get_metrics()["avg_retry_interval"] == pytest.approx(2.0)
+
+def test_metrics_snapshots_are_independent():
+    """Test each get_metrics call returns a snapshot unaffected by later data."""
+    collector = RetryMetricsCollector()
+    collector.record_attempt("req1", 0.1, "timeout")
+    
+    first = collector.get_metrics()
+    assert collector.get_metrics() is not first
+    json.dumps(first)  # Plain dicts all the way down
+    
+    collector.record_attempt("req1", 0.2, retry_count=1)
+    second = collector.get_metrics()
+    assert first["success_rate"] == pytest.approx(0.0)
+    assert second["success_rate"] == pytest.approx(0.5)
+    
+    collector.record_attempt("req2", 0.1, "network")
+    assert second["error_distribution"] == {"timeout": 1}
+
+def test_request_history_optional():
+    """Test the history can be bounded or disabled without affecting metrics."""
+    bounded = RetryMetricsCollector(max_history=2)
+    disabled = RetryMetricsCollector(max_history=0)
+    
+    for collector in (bounded, disabled):
+        collector.record_attempt("req1", 0.1)
+        collector.record_attempt("req2", 0.2, "timeout")
+        collector.record_attempt("req3", 0.3)
+    
+    assert [r["request_id"] for r in bounded._request_history] == ["req2", "req3"]
+    assert disabled._request_history is None
+    assert disabled.get_metrics()["avg_response_time"] == pytest.approx(0.2)
+    assert disabled.get_metrics()["error_distribution"] == {"timeout": 1}
+
+def test_request_history_bounded_by_default():
+    """Test long-running collectors keep a fixed-size history."""
+    collector = RetryMetricsCollector()
+    
+    for i in range(10_001):
+        collector.record_attempt(f"req{i}", 0.1)
+    
+    assert len(collector._request_history) == 10_000
+    assert collector._request_history[0]["request_id"] == "req1"
+    assert collector.total_requests == 10_001
@@ -4,71 +4,80 @@ from typing import List, AsyncIterator, Optional
 from social_integrator.utils.rate_limiting import (
     RateLimiter,
     RateLimitError,
-    with_rate_limiting,
-    AsyncBatcher
+    TokenBucketRateLimiter,
+    with_rate_limiting
 )
 
-@pytest.mark.asyncio
-async def test_rate_limiter_partial_replenishment():
-    """Test rate limiter with partial token replenishment."""
-    limiter = RateLimiter(calls=2, period=0.2)
-    
-    # Use all tokens
-    await limiter.acquire()
-    await limiter.acquire()
+pytestmark = pytest.mark.asyncio
+
+async def acquire_until_limited(limiter: RateLimiter, attempts: int) -> int:
+    """Issue `attempts` acquires at the same instant and count the granted ones.
+    
+    Returns:
+        Number of tokens acquired
+    """
+    results = await asyncio.gather(
+        *(limiter.acquire() for _ in range(attempts)),
+        return_exceptions=True
+    )
+    rejected = [r for r in results if r is not None]
+    for error in rejected:
+        if not isinstance(error, RateLimitError):
+            raise error
+        assert error.retry_after > 0
+    return attempts - len(rejected)
+
+@pytest.mark.parametrize("limiter_cls,calls,period,burst,wait,attempts,expected", [
+    # Token bucket refills ~1.5 tokens: one more acquire, then limited
+    pytest.param(TokenBucketRateLimiter, 2, 0.2, 2, 0.15, 2, (1, 1), id="partial_replenishment"),
+    # Sliding window: the 4th request of the burst is limited, and no slot
+    # frees up until the burst leaves the window, so a partial wait gains
+    # nothing
+    pytest.param(RateLimiter, 3, 0.2, 4, 0.15, 2, (0, 0), id="burst_handling"),
+    # Token bucket refills ~7.5 tokens on top of the 5 left
+    pytest.param(TokenBucketRateLimiter, 10, 0.2, 5, 0.15, 8, (6, 8), id="token_calculation"),
+])
+async def test_rate_limiter_replenishment(
+    fake_clock, limiter_cls, calls, period, burst, wait, attempts, expected
+):
+    """Test capacity regained after a burst and a partial wait."""
+    limiter = limiter_cls(calls=calls, period=period)
+    
+    # A burst beyond capacity is cut off at `calls`
+    assert await acquire_until_limited(limiter, burst) == min(burst, calls)
+    
+    fake_clock.advance(wait)
+    
+    low, high = expected
+    assert low <= await acquire_until_limited(limiter, attempts) <= high
+
+@pytest.mark.parametrize("limiter_cls,wait", [
+    # The second slot needed frees up when the first two requests leave
+    # the window
+    pytest.param(RateLimiter, 0.3, id="sliding_window"),
+    # One token short, refilled at 10 per second
+    pytest.param(TokenBucketRateLimiter, 0.1, id="token_bucket"),
+])
+async def test_rate_limiter_bulk_acquire(fake_clock, limiter_cls, wait):
+    """Test acquiring several tokens at once is all or nothing."""
+    limiter = limiter_cls(calls=3, period=0.3)
+    
+    await limiter.acquire(2)
+    with pytest.raises(RateLimitError) as exc_info:
+        await limiter.acquire(2)
+    assert exc_info.value.retry_after == pytest.approx(wait)
     
-    # Wait for partial replenishment (one token)
-    await asyncio.sleep(0.15)  # Should replenish ~1.5 tokens
+    # The rejected bulk acquire took nothing
+    await limiter.acquire(1)
+    assert limiter.get_current_capacity() == 0
     
-    # Should be able to acquire one token
-    await limiter.acquire()
+    fake_clock.advance(limiter.period)
+    await limiter.acquire(2)
     
-    # Should be rate limited again
-    with pytest.raises(RateLimitError) as exc_info:
-        await limiter.acquire()
-    assert exc_info.value.retry_after > 0
+    with pytest.raises(ValueError):
+        await limiter.acquire(4)
 
-@pytest.mark.asyncio
-async def test_rate_limiter_burst_handling():
-    """Test rate limiter handling of request bursts."""
-    limiter = RateLimiter(calls=3, period=0.2)
-    results = []
-    
-    async def make_request(delay: float = 0) -> bool:
-        if delay:
-            await asyncio.sleep(delay)
-        try:
-            await limiter.acquire()
-            results.append(True)
-            return True
-        except RateLimitError:
-            results.append(False)
-            return False
-    
-    # First burst
-    tasks = [
-        make_request(),
-        make_request(),
-        make_request(),
-        make_request()  # Should be rate limited
-    ]
-    await asyncio.gather(*tasks)
-    
-    # Wait for partial recovery
-    await asyncio.sleep(0.15)
-    
-    # Second burst
-    tasks = [
-        make_request(),
-        make_request()  # Should be rate limited
-    ]
-    await asyncio.gather(*tasks)
-    
-    assert results.count(True) == 4  # Should have 4 successful requests
-    assert results.count(False) == 2  # Should have 2 rate limited requests
-
-@pytest.mark.asyncio
-async def test_async_batcher_mixed_processing(batcher_cleanup):
+async def test_async_batcher_mixed_processing(make_batcher):
     """Test async batcher with mixed success/failure processing."""
     processed_items: List[str] = []
     failed_items: List[str] = []
@@ -80,28 +89,23 @@ async def test_async_batcher_mixed_processing(batcher_cleanup):
             processed_items.append(item)
             yield f"processed_{item}"
     
-    batcher = AsyncBatcher(
-        batch_size=2,
-        batch_timeout=0.1,
-        process_func=process_batch
-    )
+    batcher = make_batcher(process_batch)
     
+    # Add mix of successful and failing items
+    failures: List[BaseException] = []
     try:
-        # Add mix of successful and failing items
-        results = await asyncio.gather(
-            batcher.add_item("item1"),
-            batcher.add_item("item2_fail"),
-            batcher.add_item("item3"),
-            return_exceptions=True
-        )
-        
-        assert len(processed_items) == 2  # item1 and item3
-        assert any(isinstance(r, ValueError) for r in results)
-    finally:
-        await batcher.close()
+        async with asyncio.TaskGroup() as tg:
+            for item in ["item1", "item2_fail", "item3"]:
+                tg.create_task(batcher.add_item(item))
+            await asyncio.sleep(0)  # Let every item join a batch
+            batcher.flush()  # Send the partial batch instead of waiting it out
+    except* ValueError as group:
+        failures.extend(group.exceptions)
+    
+    assert len(processed_items) == 2  # item1 and item3
+    assert len(failures) == 1
 
-@pytest.mark.asyncio
-async def test_async_batcher_batch_size_trigger(batcher_cleanup):
+async def test_async_batcher_batch_size_trigger(make_batcher):
     """Test async batcher batch size triggering."""
     batch_sizes: List[int] = []
     
@@ -110,25 +114,17 @@ async def test_async_batcher_batch_size_trigger(batcher_cleanup):
         for item in items:
             yield f"processed_{item}"
     
-    batcher = AsyncBatcher(
-        batch_size=2,
-        batch_timeout=1.0,  # Long timeout to ensure size triggers batch
-        process_func=process_batch
+    batcher = make_batcher(process_batch, batch_timeout=1.0)  # Long timeout to ensure size triggers batch
+    
+    # Add exactly batch_size items
+    results = await asyncio.gather(
+        batcher.add_item("item1"),
+        batcher.add_item("item2")
     )
     
-    try:
-        # Add exactly batch_size items
-        results = await asyncio.gather(
-            batcher.add_item("item1"),
-            batcher.add_item("item2")
-        )
-        
-        assert batch_sizes == [2]  # Should process one batch of size 2
-        assert all(isinstance(r, str) for r in results)
-    finally:
-        await batcher.close()
+    assert batch_sizes == [2]  # Should process one batch of size 2
+    assert all(isinstance(r, str) for r in results)
 
-@pytest.mark.asyncio
 async def test_rate_limiter_decorator_with_args():
     """Test rate limiting decorator with function arguments."""
     results: List[tuple] = []
@@ -148,55 +144,24 @@ async def test_rate_limiter_decorator_with_args():
     
     assert results == [("a", 1), ("b", 2)]
 
-@pytest.mark.asyncio
-async def test_async_batcher_early_close(batcher_cleanup):
+async def test_async_batcher_early_close(make_batcher):
     """Test async batcher early close behavior."""
     async def process_batch(items: List[str]) -> AsyncIterator[str]:
         for item in items:
             yield f"processed_{item}"
     
-    batcher = AsyncBatcher(
-        batch_size=3,
-        batch_timeout=1.0,
-        process_func=process_batch
-    )
+    batcher = make_batcher(process_batch, batch_size=3, batch_timeout=1.0)
     
-    try:
-        # Add one item and close immediately
-        task = asyncio.create_task(batcher.add_item("item1"))
-        await asyncio.sleep(0.01)  # Give time for item to be added
-        await batcher.close()
-        
-        result = await task
-        assert result == "processed_item1"
-    finally:
-        await batcher.close()
-
-@pytest.mark.asyncio
-async def test_rate_limiter_token_calculation():
-    """Test rate limiter token calculation accuracy."""
-    limiter = RateLimiter(calls=10, period=0.2)  # 50 tokens per second
-    
-    # Use 5 tokens
-    for _ in range(5):
-        await limiter.acquire()
-    
-    # Wait for partial replenishment
-    await asyncio.sleep(0.15)  # Should replenish about 7-8 tokens
-    
-    # Should be able to acquire 7-8 more tokens
-    acquired = 0
-    for _ in range(8):
-        try:
-            await limiter.acquire()
-            acquired += 1
-        except RateLimitError:
-            break
-    
-    assert 6 <= acquired <= 8  # Allow for timing variations
+    # Add one item and close immediately
+    task = asyncio.create_task(batcher.add_item("item1"))
+    await asyncio.sleep(0)  # One loop pass runs add_item up to its await
+    assert len(batcher.current_batch) == 1
+    await batcher.close()
+    
+    result = await task
+    assert result == "processed_item1"
 
-@pytest.mark.asyncio
-async def test_async_batcher_concurrent_batches(batcher_cleanup):
+async def test_async_batcher_concurrent_batches(make_batcher):
     """Test async batcher handling multiple concurrent batches."""
     batches_processed = []
     
@@ -206,22 +171,39 @@ async def test_async_batcher_concurrent_batches(batcher_cleanup):
         for item in items:
             yield f"batch{batch_id}_{item}"
     
-    batcher = AsyncBatcher(
-        batch_size=2,
-        batch_timeout=0.1,
-        process_func=process_batch
+    batcher = make_batcher(process_batch)
+    
+    # Add items that will form multiple batches
+    results = await asyncio.gather(
+        batcher.add_item("item1"),
+        batcher.add_item("item2"),
+        batcher.add_item("item3"),
+        batcher.add_item("item4")
     )
     
-    try:
-        # Add items that will form multiple batches
-        results = await asyncio.gather(
-            batcher.add_item("item1"),
-            batcher.add_item("item2"),
-            batcher.add_item("item3"),
-            batcher.add_item("item4")
-        )
-        
-        assert len(batches_processed) == 2  # Should have processed 2 batches
-        assert all(len(batch) <= 2 for batch in batches_processed)  # Each batch should respect size limit
-    finally:
-        await batcher.close()
+    assert len(batches_processed) == 2  # Should have processed 2 batches
+    assert all(len(batch) <= 2 for batch in batches_processed)  # Each batch should respect size limit
+
+async def test_async_batcher_parallel_workers(make_batcher):
+    """Test batches are processed concurrently by multiple workers."""
+    active = 0
+    max_active = 0
+    
+    async def process_batch(items: List[str]) -> AsyncIterator[str]:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        for item in items:
+            yield f"processed_{item}"
+    
+    batcher = make_batcher(process_batch, batch_size=1, batch_timeout=1.0, concurrency=2)
+    
+    results = await asyncio.gather(
+        batcher.add_item("item1"),
+        batcher.add_item("item2")
+    )
+    
+    assert results == ["processed_item1", "processed_item2"]
+    assert max_active == 2
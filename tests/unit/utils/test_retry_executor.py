@@ -0,0 +1,99 @@
+import pytest
+import asyncio
+from social_integrator.core.platform import PlatformError, RateLimitError
+from social_integrator.utils.backoff import AdaptiveBackoffManager
+from social_integrator.utils.retry_executor import RetryExecutor
+
+def make_executor(**kwargs) -> RetryExecutor:
+    """Create an executor with near-zero backoff delays."""
+    backoff = AdaptiveBackoffManager(base_delay=0.001, max_delay=0.01)
+    return RetryExecutor(backoff=backoff, **kwargs)
+
+@pytest.mark.asyncio
+async def test_submit_many_preserves_order():
+    """Test results are returned in submission order."""
+    executor = make_executor(concurrency=3)
+
+    def operation(i: int):
+        async def run():
+            await asyncio.sleep(0.001 * (5 - i))
+            return i
+        return run
+
+    results = await executor.submit_many(operation(i) for i in range(5))
+    assert results == [0, 1, 2, 3, 4]
+
+@pytest.mark.asyncio
+async def test_submit_many_respects_concurrency():
+    """Test no more than `concurrency` operations run at once."""
+    executor = make_executor(concurrency=2)
+    current = 0
+    max_seen = 0
+
+    async def operation():
+        nonlocal current, max_seen
+        current += 1
+        max_seen = max(max_seen, current)
+        await asyncio.sleep(0.005)
+        current -= 1
+        return True
+
+    results = await executor.submit_many([operation] * 6)
+    assert results == [True] * 6
+    assert max_seen == 2
+
+@pytest.mark.asyncio
+async def test_retry_until_success():
+    """Test retryable errors are retried with backoff."""
+    executor = make_executor(max_retries=3)
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise RateLimitError("Rate limited", retry_after=0.001)
+        return {"id": "123"}
+
+    results = await executor.submit_many([flaky])
+    assert results == [{"id": "123"}]
+    assert attempts == 3
+
+@pytest.mark.asyncio
+async def test_retry_exhaustion_returns_error():
+    """Test final error is returned once retries are exhausted."""
+    executor = make_executor(max_retries=2)
+    attempts = 0
+
+    async def always_limited():
+        nonlocal attempts
+        attempts += 1
+        raise RateLimitError("Rate limited")
+
+    async def ok():
+        return "ok"
+
+    results = await executor.submit_many([always_limited, ok])
+    assert isinstance(results[0], RateLimitError)
+    assert results[1] == "ok"
+    assert attempts == 2
+
+@pytest.mark.asyncio
+async def test_no_retry_on_other_errors():
+    """Test non-retryable errors fail immediately."""
+    executor = make_executor()
+    attempts = 0
+
+    async def invalid():
+        nonlocal attempts
+        attempts += 1
+        raise PlatformError("Invalid request")
+
+    results = await executor.submit_many([invalid])
+    assert isinstance(results[0], PlatformError)
+    assert attempts == 1
+
+def test_invalid_concurrency():
+    """Test constructor validation."""
+    with pytest.raises(ValueError):
+        RetryExecutor(concurrency=0)
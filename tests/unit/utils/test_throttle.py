@@ -0,0 +1,60 @@
+import pytest
+from social_integrator.utils.throttle import AdaptiveThrottle
+
+def test_throttle_healthy_backend():
+    """Test no local rejections while the backend accepts requests."""
+    throttle = AdaptiveThrottle()
+    for _ in range(20):
+        assert not throttle.should_reject_locally()
+        throttle.record(True)
+    
+    assert throttle.reject_probability() == 0.0
+    assert throttle.local_rejects == 0
+
+def test_throttle_rejection_probability():
+    """Test rejection probability formula."""
+    throttle = AdaptiveThrottle(k=2.0)
+    for _ in range(9):
+        throttle.record(False)
+    throttle.record(True)
+    
+    # (10 - 2 * 1) / (10 + 1)
+    assert throttle.reject_probability() == pytest.approx(8 / 11)
+
+def test_throttle_rejects_when_backend_refuses():
+    """Test local rejections kick in once the backend keeps refusing."""
+    throttle = AdaptiveThrottle()
+    throttle._rng.seed(42)  # For reproducible tests
+    
+    sent = 0
+    for _ in range(50):
+        if throttle.should_reject_locally():
+            continue
+        sent += 1
+        throttle.record(False)
+    
+    assert throttle.local_rejects > 0
+    assert sent + throttle.local_rejects == 50
+    assert throttle.requests == 50
+
+def test_throttle_history_expiry(monkeypatch):
+    """Test counters only cover the rolling history window."""
+    now = 1000.0
+    monkeypatch.setattr("social_integrator.utils.throttle.time.monotonic", lambda: now)
+    
+    throttle = AdaptiveThrottle(history_time=10.0)
+    for _ in range(5):
+        throttle.record(False)
+    assert throttle.reject_probability() > 0
+    
+    now += 11.0
+    assert throttle.reject_probability() == 0.0
+    assert throttle.requests == 0
+    assert throttle.accepts == 0
+
+def test_throttle_invalid_config():
+    """Test constructor validation."""
+    with pytest.raises(ValueError):
+        AdaptiveThrottle(k=0)
+    with pytest.raises(ValueError):
+        AdaptiveThrottle(history_time=0)
@@ -0,0 +1,137 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+@dataclass
+class FakeStream:
+    """Stand-in for a response's ``content`` stream."""
+    body: bytes
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        """Yield the body in chunks of at most `size` bytes."""
+        for start in range(0, len(self.body), size):
+            yield self.body[start:start + size]
+
+@dataclass
+class FakeResponse:
+    """Lightweight stand-in for `aiohttp.ClientResponse`.
+
+    The body is `body` if given, otherwise `payload` encoded as JSON.
+    """
+    status: int = 200
+    payload: Any = None
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    url: str = "https://example.com"
+
+    @property
+    def ok(self) -> bool:
+        """Whether the status is below 400, as in aiohttp."""
+        return self.status < 400
+
+    @property
+    def content(self) -> FakeStream:
+        """Stream over the response body."""
+        return FakeStream(self._body())
+
+    def _body(self) -> bytes:
+        if self.body is not None:
+            return self.body
+        return json.dumps(self.payload).encode()
+
+    async def read(self) -> bytes:
+        """Get the whole response body."""
+        return self._body()
+
+    async def json(self, loads: Callable[[Any], Any] = json.loads, **kwargs: Any) -> Any:
+        """Decode the response body with `loads`."""
+        return loads(self._body())
+
+    def raise_for_status(self) -> None:
+        """Raise `aiohttp.ClientResponseError` for error statuses."""
+        if not self.ok:
+            url = URL(self.url)
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(url, "GET", CIMultiDictProxy(CIMultiDict()), url),
+                (),
+                status=self.status
+            )
+
+    def release(self) -> None:
+        """Release the connection (no-op)."""
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+# What a fake request resolves to: a response, or an exception to raise
+Outcome = Union[FakeResponse, BaseException]
+
+class _FakeRequest:
+    """Awaitable, async context manager request, like aiohttp's."""
+
+    def __init__(self, outcome: Outcome):
+        self._outcome = outcome
+
+    async def _resolve(self) -> FakeResponse:
+        if isinstance(self._outcome, BaseException):
+            raise self._outcome
+        return self._outcome
+
+    def __await__(self):
+        return self._resolve().__await__()
+
+    async def __aenter__(self) -> FakeResponse:
+        return await self._resolve()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+@dataclass
+class FakeSession:
+    """Lightweight stand-in for `aiohttp.ClientSession`.
+
+    `responses` maps an HTTP method to the outcome of every request with
+    that method, or to a list of outcomes consumed one request at a time.
+    """
+    responses: Dict[str, Union[Outcome, List[Outcome]]] = field(default_factory=dict)
+    calls: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    close_count: int = 0
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> _FakeRequest:
+        self.calls.append((method, url, kwargs))
+        outcome = self.responses[method]
+        if isinstance(outcome, list):
+            outcome = outcome.pop(0)
+        return _FakeRequest(outcome)
+
+    def get(self, url: str, **kwargs: Any) -> _FakeRequest:
+        return self._request("get", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> _FakeRequest:
+        return self._request("post", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> _FakeRequest:
+        return self._request("delete", url, **kwargs)
+
+    async def close(self) -> None:
+        """Count the close (the session stays usable)."""
+        self.close_count += 1
+
+@dataclass
+class FakeClock:
+    """Manually advanced stand-in for `time.monotonic`."""
+    now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by `seconds`."""
+        self.now += seconds
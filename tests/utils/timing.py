@@ -1,11 +1,16 @@
 import asyncio
 import functools
+import math
+import os
 import time
 from typing import Optional, Callable, TypeVar, ParamSpec
 
 P = ParamSpec('P')
 T = TypeVar('T')
 
+# Bound once so timing reads skip the module attribute lookup
+_monotonic = time.monotonic
+
 def retry_with_backoff(
     max_retries: int = 3,
     initial_delay: float = 0.1,
@@ -14,6 +19,10 @@ def retry_with_backoff(
 ) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """Decorator for retrying flaky timing-sensitive tests with exponential backoff.
     
+    Runs the test only once while ``PYTEST_DETERMINISTIC`` is set, as it is
+    by the ``fake_clock`` fixture: with virtual time a failure is real and
+    retrying it only adds backoff delays.
+    
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay between retries in seconds
@@ -23,6 +32,9 @@ def retry_with_backoff(
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
         @functools.wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if os.environ.get("PYTEST_DETERMINISTIC"):
+                return await func(*args, **kwargs)
+            
             delay = initial_delay
             last_exception = None
             
@@ -48,6 +60,8 @@ class TimingContext:
             await some_operation()
             timing.assert_elapsed(0.5, delta=0.1)  # Assert operation took 0.5s ± 0.1s
     """
+
+    __slots__ = ("timeout", "precision", "start_time", "end_time")
     
     def __init__(self, timeout: float, precision: float = 0.1):
         """Initialize timing context.
@@ -62,21 +76,22 @@ class TimingContext:
         self.end_time = 0.0
     
     async def __aenter__(self):
-        self.start_time = time.monotonic()
+        self.start_time = _monotonic()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.end_time = time.monotonic()
-        if exc_type is None and self.elapsed > self.timeout:
+        self.end_time = _monotonic()
+        elapsed = self.end_time - self.start_time
+        if exc_type is None and elapsed > self.timeout:
             raise TimeoutError(
                 f"Operation exceeded timeout of {self.timeout}s "
-                f"(took {self.elapsed:.2f}s)"
+                f"(took {elapsed:.2f}s)"
             )
     
     @property
     def elapsed(self) -> float:
         """Get elapsed time in seconds."""
-        return self.end_time - self.start_time if self.end_time else time.monotonic() - self.start_time
+        return (self.end_time or _monotonic()) - self.start_time
     
     def assert_elapsed(self, expected: float, delta: Optional[float] = None):
         """Assert that elapsed time matches expected duration.
@@ -87,7 +102,7 @@ class TimingContext:
         """
         delta = delta or self.precision
         actual = self.elapsed
-        assert abs(actual - expected) <= delta, \
+        assert math.isclose(actual, expected, rel_tol=0.0, abs_tol=delta), \
             f"Expected duration {expected}s ± {delta}s, got {actual:.2f}s"
     
     def assert_min_elapsed(self, minimum: float):